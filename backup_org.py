@@ -7,22 +7,163 @@ and pushes them to a destination organization.
 """
 
 import argparse
+import gzip
 import json
 import logging
 import os
-import shutil
+import queue
 import subprocess
 import sys
+import tempfile
+import threading
 import time
+import urllib.parse
+import zlib
+from collections import Counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import contextmanager
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
-from typing import Dict, List, Optional, Set
+from typing import Dict, List, Optional, Set, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from json_utils import json_loads
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+# Number of repository listing pages fetched concurrently
+PAGE_FETCH_WORKERS = 8
+
+# Number of destination repositories created concurrently
+CREATE_WORKERS = 16
+
+# Maximum number of aliased repository lookups per GraphQL query
+GRAPHQL_BATCH_SIZE = 100
+
+# Remaining API budget below which requests are spread out until the reset
+RATE_LIMIT_RESERVE = 100
+
+# Attempts made for a request that keeps hitting a rate limit
+RATE_LIMIT_MAX_ATTEMPTS = 5
+
+# Seconds between saves of the backup state while repositories are pushed;
+# it is always saved once more when the run ends
+STATE_SAVE_INTERVAL = 30
+
+# Refspecs used to mirror a repository, skipping pull request refs
+MIRROR_REFSPECS = ['+refs/*:refs/*', '^refs/pull/*']
+
+# Refspecs pushed to the destination repository
+PUSH_REFSPECS = [
+    '+refs/heads/*:refs/heads/*',
+    '+refs/tags/*:refs/tags/*',
+    '+refs/notes/*:refs/notes/*',
+]
+
+# Pack settings for fetch/push: index and delta-search on all cores, bound
+# the delta window memory and favour speed over size when compressing
+GIT_PACK_OPTIONS = [
+    '-c', f'pack.threads={os.cpu_count() or 1}',
+    '-c', 'pack.windowMemory=256m',
+    '-c', 'core.compression=1',
+]
+
+class RateLimitedSession(requests.Session):
+    """Session that paces requests using GitHub's rate limit headers.
+    
+    Every response updates the pacing from ``X-RateLimit-Remaining`` and
+    ``X-RateLimit-Reset``: once the remaining budget drops below
+    RATE_LIMIT_RESERVE, requests are spaced so that the budget lasts until
+    the reset. Requests rejected by a primary or secondary rate limit are
+    retried after the wait the server asks for.
+    
+    An optional semaphore, shared between sessions, caps the number of
+    requests in flight to stay below GitHub's concurrent request limit.
+    """
+    
+    def __init__(self, api_semaphore: Optional[threading.BoundedSemaphore] = None):
+        super().__init__()
+        self.logger = logging.getLogger(__name__)
+        self._api_semaphore = api_semaphore
+        # Notified whenever the schedule moves earlier, so waiting threads recheck
+        self._schedule_changed = threading.Condition()
+        self._interval = 0.0
+        self._next_slot = 0.0
+    
+    def _wait_for_slot(self) -> None:
+        """Block until the pacing schedule allows the next request."""
+        with self._schedule_changed:
+            while True:
+                now = time.monotonic()
+                if self._next_slot <= now:
+                    self._next_slot = now + self._interval
+                    return
+                self._schedule_changed.wait(self._next_slot - now)
+    
+    def _update_pacing(self, response: requests.Response) -> Optional[float]:
+        """Update pacing from a response.
+        
+        Returns None if the request was not rate limited, otherwise how long
+        the caller must sleep before retrying it; an exhausted primary rate
+        limit instead holds the schedule until the reset and returns 0.
+        """
+        remaining = response.headers.get('X-RateLimit-Remaining')
+        reset = response.headers.get('X-RateLimit-Reset')
+        
+        if remaining is not None and reset is not None:
+            remaining = int(remaining)
+            seconds_until_reset = max(1.0, int(reset) - time.time())
+            with self._schedule_changed:
+                now = time.monotonic()
+                if remaining == 0:
+                    # Nothing left to spread out: hold every request until the reset
+                    self._interval = 0.0
+                    self._next_slot = max(self._next_slot, now + seconds_until_reset + 1)
+                else:
+                    if remaining < RATE_LIMIT_RESERVE:
+                        self._interval = seconds_until_reset / remaining
+                    else:
+                        self._interval = 0.0
+                    # Slots scheduled under a smaller budget (or before a
+                    # reset) must not delay requests the budget now allows
+                    if self._next_slot > now + self._interval:
+                        self._next_slot = now + self._interval
+                        self._schedule_changed.notify_all()
+        
+        if response.status_code not in (403, 429):
+            return None
+        if 'Retry-After' in response.headers:
+            # Secondary rate limit
+            return float(response.headers['Retry-After'])
+        if remaining == 0:
+            self.logger.warning(f"Rate limit reached. Waiting {seconds_until_reset + 1:.0f} seconds for the reset...")
+            return 0.0
+        return None
+    
+    def request(self, method, url, *args, **kwargs):
+        for attempt in range(1, RATE_LIMIT_MAX_ATTEMPTS + 1):
+            self._wait_for_slot()
+            if self._api_semaphore is None:
+                response = super().request(method, url, *args, **kwargs)
+            else:
+                with self._api_semaphore:
+                    response = super().request(method, url, *args, **kwargs)
+            
+            wait_time = self._update_pacing(response)
+            if wait_time is None or attempt == RATE_LIMIT_MAX_ATTEMPTS:
+                return response
+            
+            if wait_time > 0:
+                self.logger.warning(f"Rate limit reached. Waiting {wait_time:.0f} seconds...")
+                time.sleep(wait_time)
+
 
 class GitHubOrgBackup:
     """Main class for backing up GitHub organization repositories."""
@@ -33,7 +174,11 @@ class GitHubOrgBackup:
                  include_private: bool = False,
                  workers: int = 3,
                  repo_prefix: str = "",
-                 include_date_prefix: bool = False):
+                 include_date_prefix: bool = False,
+                 cache_dir: str = "~/.cache/gh-org-backup",
+                 api_concurrency: int = 10,
+                 state_file: str = "./backup_state.json",
+                 force: bool = False):
         self.source_org = source_org
         self.dest_org = dest_org
         self.source_token = source_token
@@ -43,119 +188,266 @@ class GitHubOrgBackup:
         self.workers = workers
         self.repo_prefix = repo_prefix
         self.include_date_prefix = include_date_prefix
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.state_file = Path(state_file)
+        self.force = force
         
         # Generate date prefix if requested
         if self.include_date_prefix:
             date_prefix = datetime.now().strftime("%Y%m%d-")
             self.repo_prefix = date_prefix + self.repo_prefix
         
+        # Destination names are the final prefix plus the original name; bind
+        # the concatenation once since it runs several times per repository
+        self.get_dest_repo_name = self.repo_prefix.__add__
+        self._backup_desc_prefix = f"[BACKUP from {self.source_org}/"
+        
         # Setup logging
         self.setup_logging()
         
+        # Concurrent API requests across both sessions
+        self._api_sem = threading.BoundedSemaphore(api_concurrency)
+        
         # Setup HTTP sessions with retry logic
         self.source_session = self.create_session(source_token)
         self.dest_session = self.create_session(dest_token)
         
+        # Destination repository names known to exist
+        self._existing: Set[str] = set()
+        
+        # Source pushed_at of the last successful backup, per destination repository
+        self._state: Dict[str, str] = {}
+        self._state_lock = threading.Lock()
+        # Serialises writes so an older snapshot never replaces a newer one
+        self._state_save_lock = threading.Lock()
+        self._state_dirty = False
+        self._next_state_save = 0.0
+        
         # Statistics
-        self.stats = {
-            'total_repos': 0,
-            'successful': 0,
-            'failed': 0,
-            'skipped': 0
-        }
+        self._total = 0
+        self._counts = Counter()
     
     def setup_logging(self):
-        """Configure logging for the application."""
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            handlers=[
-                logging.FileHandler('backup.log'),
-                logging.StreamHandler(sys.stdout)
-            ]
-        )
+        """Configure logging for the application.
+        
+        Worker threads only enqueue records; a background listener formats
+        them and writes to the log file and stdout.
+        """
+        formatter = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
+        handlers = [
+            logging.FileHandler('backup.log'),
+            logging.StreamHandler(sys.stdout)
+        ]
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        
+        log_queue = queue.Queue(-1)
+        root_logger = logging.getLogger()
+        root_logger.setLevel(logging.INFO)
+        # Kept so run_backup can detach it from the root logger when done
+        self.queue_handler = QueueHandler(log_queue)
+        root_logger.addHandler(self.queue_handler)
+        
+        self.log_listener = QueueListener(log_queue, *handlers)
+        self.log_listener.start()
         self.logger = logging.getLogger(__name__)
     
     def create_session(self, token: str) -> requests.Session:
-        """Create a requests session with retry logic and authentication."""
-        session = requests.Session()
+        """Create a rate-limited requests session with retry logic and authentication."""
+        session = RateLimitedSession(self._api_sem)
         session.headers.update({
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json',
             'User-Agent': 'GitHub-Org-Backup-Tool/1.0'
         })
         
-        # Retry strategy
+        # Retry strategy; POST is included so repository creation and
+        # GraphQL queries are retried on server errors as well
         retry_strategy = Retry(
             total=3,
             backoff_factor=1,
             status_forcelist=[429, 500, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'POST']),
+            respect_retry_after_header=True,
+        )
+        # Size the connection pool for all concurrent workers and block when
+        # it is exhausted rather than opening connections that get discarded
+        adapter = HTTPAdapter(
+            pool_connections=self.workers * 2,
+            pool_maxsize=max(self.workers * 4, PAGE_FETCH_WORKERS),
+            pool_block=True,
+            max_retries=retry_strategy
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
         session.mount("https://", adapter)
         
         return session
     
+    def _page_cache_path(self, org: str, params: Dict) -> Path:
+        """Return the cache file path (without suffix) for a repository listing page."""
+        return self.cache_dir / org / f"{params['type']}-{params['per_page']}-page-{params['page']}"
+    
+    def _load_cached_page(self, cache_path: Path) -> Optional[List[Dict]]:
+        """Load a cached repository listing page, if present."""
+        try:
+            with gzip.open(cache_path.with_suffix('.json.gz'), 'rb') as f:
+                return json_loads(f.read())
+        except (OSError, ValueError, EOFError, zlib.error):
+            # Missing, truncated or corrupt entries are just cache misses
+            return None
+    
+    def _store_cached_page(self, cache_path: Path, etag: Optional[str], page_repos: List[Dict]) -> None:
+        """Persist a repository listing page together with its ETag."""
+        if not etag:
+            return
+        body_path = cache_path.with_suffix('.json.gz')
+        etag_path = cache_path.with_suffix('.etag')
+        tmp_paths = []
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            # Drop the old ETag first so an interrupted write can never pair
+            # it with a different body; without one the page is refetched
+            etag_path.unlink(missing_ok=True)
+            
+            # Write both files under temporary names and rename them into
+            # place, so another run or a Ctrl-C never sees a partial file
+            fd, tmp_body = tempfile.mkstemp(dir=cache_path.parent, prefix=f"{cache_path.name}.", suffix='.tmp')
+            tmp_paths.append(tmp_body)
+            with os.fdopen(fd, 'wb') as raw, gzip.open(raw, 'wt') as f:
+                json.dump(page_repos, f)
+            fd, tmp_etag = tempfile.mkstemp(dir=cache_path.parent, prefix=f"{cache_path.name}.", suffix='.tmp')
+            tmp_paths.append(tmp_etag)
+            with os.fdopen(fd, 'w') as f:
+                f.write(etag)
+            
+            os.replace(tmp_body, body_path)
+            os.replace(tmp_etag, etag_path)
+        except OSError as e:
+            self.logger.debug(f"Could not write page cache {cache_path}: {e}")
+        finally:
+            for tmp_path in tmp_paths:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+    
+    def _fetch_page(self, org: str, session: requests.Session, page: int,
+                    per_page: int) -> Tuple[List[Dict], requests.Response]:
+        """Fetch a single page of the organization repository listing.
+        
+        The page is fetched with a conditional request: its ETag is cached on
+        disk and a 304 Not Modified response reuses the cached body.
+        """
+        url = f"https://api.github.com/orgs/{org}/repos"
+        params = {
+            'page': page,
+            'per_page': per_page,
+            'type': 'all' if self.include_private else 'public'
+        }
+        
+        cache_path = self._page_cache_path(org, params)
+        cached_repos = self._load_cached_page(cache_path)
+        headers = {}
+        if cached_repos is not None:
+            try:
+                headers['If-None-Match'] = cache_path.with_suffix('.etag').read_text().strip()
+            except OSError:
+                pass
+        
+        response = session.get(url, params=params, headers=headers)
+        
+        if response.status_code == 304:
+            page_repos = cached_repos
+        else:
+            response.raise_for_status()
+            page_repos = json_loads(response.content)
+            self._store_cached_page(cache_path, response.headers.get('ETag'), page_repos)
+        
+        cached_note = " (cached)" if response.status_code == 304 else ""
+        self.logger.info(f"Fetched {len(page_repos)} repositories (page {page}){cached_note}")
+        return page_repos, response
+    
     def get_repositories(self, org: str, session: requests.Session) -> List[Dict]:
-        """Get all repositories from a GitHub organization."""
-        repos = []
-        page = 1
+        """Get all repositories from a GitHub organization.
+        
+        The first page is fetched on its own to learn the page count from the
+        ``Link: rel="last"`` header; the remaining pages are then fetched
+        concurrently.
+        """
         per_page = 100
         
         self.logger.info(f"Fetching repositories from {org}...")
         
-        while True:
-            url = f"https://api.github.com/orgs/{org}/repos"
-            params = {
-                'page': page,
-                'per_page': per_page,
-                'type': 'all' if self.include_private else 'public'
-            }
+        try:
+            repos, response = self._fetch_page(org, session, 1, per_page)
             
-            try:
-                response = session.get(url, params=params)
-                
-                if response.status_code == 403:
-                    # Check if it's a rate limit
-                    if 'X-RateLimit-Remaining' in response.headers:
-                        remaining = int(response.headers['X-RateLimit-Remaining'])
-                        if remaining == 0:
-                            reset_time = int(response.headers['X-RateLimit-Reset'])
-                            wait_time = reset_time - int(time.time()) + 1
-                            self.logger.warning(f"Rate limit reached. Waiting {wait_time} seconds...")
-                            time.sleep(wait_time)
-                            continue
-                
-                response.raise_for_status()
-                page_repos = response.json()
-                
-                if not page_repos:
-                    break
+            last_link = response.links.get('last', {}).get('url')
+            if last_link:
+                query = urllib.parse.urlparse(last_link).query
+                last_page = int(urllib.parse.parse_qs(query)['page'][0])
                 
-                repos.extend(page_repos)
-                self.logger.info(f"Fetched {len(page_repos)} repositories (page {page})")
-                page += 1
+                with ThreadPoolExecutor(max_workers=PAGE_FETCH_WORKERS) as executor:
+                    futures = [
+                        executor.submit(self._fetch_page, org, session, page, per_page)
+                        for page in range(2, last_page + 1)
+                    ]
+                    # Collect in submission order to keep the listing order stable
+                    for future in futures:
+                        page_repos, _ = future.result()
+                        repos.extend(page_repos)
+            else:
+                # No Link header (e.g. on a 304): walk the remaining pages serially
+                page = 1
+                page_repos = repos
+                while len(page_repos) == per_page:
+                    page += 1
+                    page_repos, _ = self._fetch_page(org, session, page, per_page)
+                    repos.extend(page_repos)
                 
-            except requests.exceptions.RequestException as e:
-                self.logger.error(f"Error fetching repositories: {e}")
-                raise
+        except requests.exceptions.RequestException as e:
+            self.logger.error(f"Error fetching repositories: {e}")
+            raise
         
         self.logger.info(f"Found {len(repos)} repositories in {org}")
         return repos
     
-    def get_dest_repo_name(self, original_name: str) -> str:
-        """Generate the destination repository name with prefix."""
-        return f"{self.repo_prefix}{original_name}"
+    def prefetch_existing_dest_repos(self, names: List[str]) -> None:
+        """Look up which destination repositories already exist.
+        
+        Uses batched GraphQL queries (one aliased ``repository`` lookup per
+        name) instead of one REST call per repository.
+        """
+        url = "https://api.github.com/graphql"
+        
+        for i in range(0, len(names), GRAPHQL_BATCH_SIZE):
+            batch = names[i:i + GRAPHQL_BATCH_SIZE]
+            variables = {'org': self.dest_org}
+            declarations = ['$org: String!']
+            lookups = []
+            for j, name in enumerate(batch):
+                variables[f'n{j}'] = name
+                declarations.append(f'$n{j}: String!')
+                lookups.append(f'r{j}: repository(name: $n{j}) {{ id }}')
+            
+            query = (f"query({', '.join(declarations)}) {{ "
+                     f"organization(login: $org) {{ {' '.join(lookups)} }} }}")
+            
+            try:
+                response = self.dest_session.post(url, json={'query': query, 'variables': variables})
+                response.raise_for_status()
+                # Missing repositories come back as null together with NOT_FOUND errors
+                organization = (json_loads(response.content).get('data') or {}).get('organization') or {}
+            except (requests.exceptions.RequestException, ValueError) as e:
+                self.logger.warning(f"Could not look up existing repositories in {self.dest_org}: {e}")
+                continue
+            
+            self._existing.update(batch[int(alias[1:])] for alias, repo in organization.items() if repo)
+        
+        self.logger.info(f"{len(self._existing)} of {len(names)} repositories already exist in {self.dest_org}")
     
     def repository_exists(self, repo_name: str) -> bool:
-        """Check if a repository exists in the destination organization."""
-        dest_name = self.get_dest_repo_name(repo_name)
-        url = f"https://api.github.com/repos/{self.dest_org}/{dest_name}"
-        try:
-            response = self.dest_session.get(url)
-            return response.status_code == 200
-        except requests.exceptions.RequestException:
-            return False
+        """Check if a repository exists in the destination organization.
+        
+        Answered from the set populated by prefetch_existing_dest_repos().
+        """
+        return self.get_dest_repo_name(repo_name) in self._existing
     
     def create_repository(self, repo_data: Dict) -> bool:
         """Create a repository in the destination organization."""
@@ -166,7 +458,7 @@ class GitHubOrgBackup:
         
         # Update description to include source information
         original_desc = repo_data.get('description', '')
-        backup_desc = f"[BACKUP from {self.source_org}/{original_name}] {original_desc}".strip()
+        backup_desc = f"{self._backup_desc_prefix}{original_name}] {original_desc}".strip()
         
         payload = {
             'name': dest_name,
@@ -183,12 +475,14 @@ class GitHubOrgBackup:
             
             if response.status_code == 201:
                 self.logger.info(f"Created repository: {dest_name}")
+                self._existing.add(dest_name)
                 return True
             elif response.status_code == 422:
                 # Repository might already exist
-                error_msg = response.json().get('message', '')
+                error_msg = json_loads(response.content).get('message', '')
                 if 'already exists' in error_msg.lower():
                     self.logger.info(f"Repository {dest_name} already exists")
+                    self._existing.add(dest_name)
                     return True
                 else:
                     self.logger.error(f"Error creating repository {dest_name}: {error_msg}")
@@ -201,20 +495,48 @@ class GitHubOrgBackup:
             self.logger.error(f"Error creating repository {dest_name}: {e}")
             return False
     
+    def run_git(self, args: List[str], cwd: Optional[Path] = None,
+                timeout: Optional[int] = None) -> subprocess.CompletedProcess:
+        """Run a git command without a terminal so it can never block on a prompt."""
+        env = dict(os.environ, GIT_TERMINAL_PROMPT='0')
+        return subprocess.run(
+            ['git', *args],
+            cwd=str(cwd) if cwd else None,
+            env=env,
+            stdin=subprocess.DEVNULL,
+            capture_output=True,
+            text=True,
+            timeout=timeout
+        )
+    
     def clone_repository(self, repo_data: Dict, clone_path: Path) -> bool:
-        """Clone a repository to the local filesystem."""
+        """Clone a repository to the local filesystem, or update an existing mirror.
+        
+        The source URL (with its token) is passed to git fetch directly and is
+        never stored in the mirror's configuration.
+        """
         clone_url = repo_data['clone_url'].replace(
             'https://github.com/',
             f'https://{self.source_token}@github.com/'
         )
         
         try:
-            self.logger.info(f"Cloning {repo_data['name']}...")
+            if (clone_path / 'HEAD').exists():
+                # Existing mirror: only the missing objects are fetched
+                self.logger.info(f"Updating mirror of {repo_data['name']}...")
+            else:
+                self.logger.info(f"Cloning {repo_data['name']}...")
+                result = self.run_git(['init', '--bare', '--quiet', str(clone_path)])
+                if result.returncode != 0:
+                    self.logger.error(f"Error cloning {repo_data['name']}: {result.stderr}")
+                    return False
             
-            # Clone with all branches and tags
-            result = subprocess.run([
-                'git', 'clone', '--mirror', clone_url, str(clone_path)
-            ], capture_output=True, text=True, timeout=3600)  # 1 hour timeout
+            # Mirror all branches and tags; pull request refs are excluded up
+            # front since GitHub rejects them on push
+            result = self.run_git(
+                [*GIT_PACK_OPTIONS, 'fetch', '--quiet', '--prune', clone_url, *MIRROR_REFSPECS],
+                cwd=clone_path, timeout=3600  # 1 hour timeout
+            )
             
             if result.returncode == 0:
                 self.logger.info(f"Successfully cloned {repo_data['name']}")
@@ -238,69 +560,41 @@ class GitHubOrgBackup:
         try:
             self.logger.info(f"Pushing {repo_name} -> {dest_name}...")
             
-            # Verify clone path exists
-            if not clone_path.exists():
-                self.logger.error(f"Clone path does not exist: {clone_path}")
-                return False
+            # An empty repository has nothing to push
+            get_refs_result = self.run_git(['for-each-ref', '--count=1', '--format=%(refname)'],
+                                           cwd=clone_path)
             
-            # Change to the cloned repository directory
-            original_cwd = os.getcwd()
-            os.chdir(clone_path)
+            if not get_refs_result.stdout.strip():
+                self.logger.warning(f"No valid refs found for {repo_name}")
+                return True
             
-            try:
-                # First, try to push all branches and tags, excluding pull request refs
-                # Get all refs except pull request refs
-                get_refs_result = subprocess.run([
-                    'git', 'for-each-ref', '--format=%(refname)', 'refs/'
-                ], capture_output=True, text=True)
-                
-                if get_refs_result.returncode != 0:
-                    self.logger.error(f"Error getting refs for {repo_name}: {get_refs_result.stderr}")
-                    return False
-                
-                # Filter out pull request refs and other unwanted refs
-                all_refs = get_refs_result.stdout.strip().split('\n')
-                valid_refs = [ref for ref in all_refs if ref and not ref.startswith('refs/pull/')]
-                
-                if not valid_refs:
-                    self.logger.warning(f"No valid refs found for {repo_name}")
-                    return True
+            # Push branches, tags and notes in one go; git enumerates the
+            # matching refs itself
+            result = self.run_git([*GIT_PACK_OPTIONS, 'push', dest_url, *PUSH_REFSPECS],
+                                  cwd=clone_path, timeout=3600)
+            
+            if result.returncode != 0:
+                # If the push fails, try individual refs to find the culprits
+                self.logger.warning(f"Push failed for {repo_name}, trying individual refs...")
+                refs_result = self.run_git(
+                    ['for-each-ref', '--format=%(refname)', 'refs/heads/', 'refs/tags/', 'refs/notes/'],
+                    cwd=clone_path
+                )
+                failed_refs = []
                 
-                # Push refs in batches to avoid overwhelming the server
-                batch_size = 50
-                for i in range(0, len(valid_refs), batch_size):
-                    batch_refs = valid_refs[i:i + batch_size]
-                    
-                    # Push this batch of refs
-                    push_cmd = ['git', 'push', dest_url] + [f"{ref}:{ref}" for ref in batch_refs]
-                    result = subprocess.run(push_cmd, capture_output=True, text=True, timeout=3600)
-                    
-                    if result.returncode != 0:
-                        # If batch push fails, try individual refs
-                        self.logger.warning(f"Batch push failed for {repo_name}, trying individual refs...")
-                        failed_refs = []
-                        
-                        for ref in batch_refs:
-                            single_result = subprocess.run([
-                                'git', 'push', dest_url, f"{ref}:{ref}"
-                            ], capture_output=True, text=True, timeout=600)
-                            
-                            if single_result.returncode != 0:
-                                # Only log as warning for pull request refs, error for others
-                                if 'refs/pull/' in ref:
-                                    self.logger.debug(f"Skipped pull request ref {ref} (expected)")
-                                else:
-                                    self.logger.warning(f"Failed to push ref {ref}: {single_result.stderr.strip()}")
-                                    failed_refs.append(ref)
-                        
-                        if failed_refs and not any('refs/pull/' in ref for ref in failed_refs):
-                            self.logger.error(f"Failed to push some important refs for {repo_name}: {failed_refs}")
+                for ref in refs_result.stdout.split():
+                    single_result = self.run_git(['push', dest_url, f"+{ref}:{ref}"],
+                                                 cwd=clone_path, timeout=600)
+                    if single_result.returncode != 0:
+                        self.logger.warning(f"Failed to push ref {ref}: {single_result.stderr.strip()}")
+                        failed_refs.append(ref)
                 
-                self.logger.info(f"Successfully pushed {repo_name} -> {dest_name}")
-                return True
-                    
-            finally:
-                os.chdir(original_cwd)
+                if failed_refs:
+                    self.logger.error(f"Failed to push some refs for {repo_name}: {failed_refs}")
+                    return False
+            
+            self.logger.info(f"Successfully pushed {repo_name} -> {dest_name}")
+            return True
                 
         except subprocess.TimeoutExpired:
             self.logger.error(f"Timeout pushing {repo_name} -> {dest_name}")
@@ -309,60 +603,135 @@ class GitHubOrgBackup:
             self.logger.error(f"Error pushing {repo_name} -> {dest_name}: {e}")
             return False
     
+    def _state_key(self, repo_data: Dict) -> str:
+        """Return the backup state key (destination full name) for a repository."""
+        return f"{self.dest_org}/{self.get_dest_repo_name(repo_data['name'])}"
+    
+    def load_state(self) -> None:
+        """Load the pushed_at timestamps recorded by previous runs."""
+        try:
+            with open(self.state_file, 'r') as f:
+                self._state = json.load(f)
+        except FileNotFoundError:
+            self._state = {}
+        except (OSError, ValueError) as e:
+            self.logger.warning(f"Ignoring unreadable backup state {self.state_file}: {e}")
+            self._state = {}
+    
+    def record_backup(self, repo_data: Dict) -> None:
+        """Record a successful backup so unchanged repositories are skipped next time.
+        
+        The state file is rewritten at most every STATE_SAVE_INTERVAL seconds
+        here; run_backup saves the rest when the run ends.
+        """
+        with self._state_lock:
+            self._state[self._state_key(repo_data)] = repo_data.get('pushed_at')
+            self._state_dirty = True
+            now = time.monotonic()
+            save_due = now >= self._next_state_save
+            if save_due:
+                self._next_state_save = now + STATE_SAVE_INTERVAL
+        
+        if save_due:
+            self.save_state()
+    
+    def save_state(self) -> None:
+        """Write the recorded state to disk if it changed since the last save."""
+        with self._state_save_lock:
+            with self._state_lock:
+                if not self._state_dirty:
+                    return
+                state = dict(self._state)
+                self._state_dirty = False
+            
+            tmp_file = self.state_file.with_name(self.state_file.name + '.tmp')
+            try:
+                with open(tmp_file, 'w') as f:
+                    json.dump(state, f, indent=2)
+                os.replace(tmp_file, self.state_file)
+            except OSError as e:
+                self.logger.warning(f"Could not save backup state {self.state_file}: {e}")
+                with self._state_lock:
+                    self._state_dirty = True
+    
+    def skip_unchanged(self, repos: List[Dict]) -> List[Dict]:
+        """Drop repositories not pushed to since their last successful backup.
+        
+        A repository is only skipped while its destination still exists.
+        """
+        changed = []
+        for repo in repos:
+            if (repo.get('pushed_at') is not None
+                    and self._state.get(self._state_key(repo)) == repo['pushed_at']
+                    and self.repository_exists(repo['name'])):
+                self._counts['skipped'] += 1
+            else:
+                changed.append(repo)
+        
+        if self._counts['skipped']:
+            self.logger.info(f"Skipping {self._counts['skipped']} repositories unchanged since the last backup")
+        return changed
+    
+    def _ensure_dest_repo(self, repo_data: Dict) -> bool:
+        """Create the destination repository unless it already exists."""
+        return self.repository_exists(repo_data['name']) or self.create_repository(repo_data)
+    
+    def prefetch_create(self, repos: List[Dict]) -> List[Dict]:
+        """Create all missing destination repositories ahead of cloning.
+        
+        The small creation requests run concurrently; repositories whose
+        destination could not be created are counted as failed and left out
+        of the returned list.
+        """
+        with ThreadPoolExecutor(max_workers=CREATE_WORKERS) as executor:
+            results = list(executor.map(self._ensure_dest_repo, repos))
+        
+        ready = [repo for repo, created in zip(repos, results) if created]
+        self._counts['failed'] += len(repos) - len(ready)
+        return ready
+    
+    @contextmanager
+    def mirror_lock(self, mirror_path: Path):
+        """Hold an exclusive lock on a mirror while it is updated and pushed.
+        
+        Lock files live in a ``.locks`` subdirectory of the clone directory,
+        created on first use; they are never deleted, since removing a file
+        another run has locked would let a third run lock a new one.
+        """
+        if fcntl is None:
+            yield
+            return
+        lock_dir = mirror_path.parent / '.locks'
+        lock_dir.mkdir(exist_ok=True)
+        with open(lock_dir / f"{mirror_path.name}.lock", 'w') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+    
     def backup_repository(self, repo_data: Dict) -> bool:
-        """Backup a single repository."""
+        """Backup a single repository.
+        
+        The destination repository must already exist (see prefetch_create).
+        Mirrors are kept in the clone directory between runs so later runs
+        only fetch new objects.
+        """
         repo_name = repo_data['name']
-        # Use timestamp and process id to ensure unique clone paths for concurrent operations
-        import os
-        timestamp = int(time.time() * 1000000)  # microsecond precision
-        pid = os.getpid()
-        unique_id = f"{timestamp}-{pid}-{hash(repo_name) % 10000:04d}"
-        clone_path = self.clone_dir.absolute() / f"{repo_name}-{unique_id}.git"
+        mirror_path = self.clone_dir.absolute() / f"{repo_name}.git"
         
         try:
-            # Ensure clone directory exists
-            self.clone_dir.mkdir(parents=True, exist_ok=True)
-            
-            # Check if destination repository exists, create if not
-            if not self.repository_exists(repo_name):
-                if not self.create_repository(repo_data):
+            with self.mirror_lock(mirror_path):
+                # Create or update the local mirror
+                if not self.clone_repository(repo_data, mirror_path):
                     return False
+                
+                # Push to destination
+                success = self.push_repository(repo_name, mirror_path)
             
-            # Clone the repository
-            if not self.clone_repository(repo_data, clone_path):
-                return False
-            
-            # Verify clone was successful before pushing
-            if not clone_path.exists():
-                self.logger.error(f"Clone path {clone_path} does not exist after cloning {repo_name}")
-                return False
-            
-            # Additional verification - check if it's a valid git repository
-            if not (clone_path / 'refs').exists() or not (clone_path / 'objects').exists():
-                self.logger.error(f"Clone path {clone_path} exists but is not a valid git repository for {repo_name}")
-                return False
-            
-            # Push to destination
-            success = self.push_repository(repo_name, clone_path)
-            
-            # Cleanup
-            try:
-                if clone_path.exists():
-                    shutil.rmtree(clone_path)
-            except Exception as cleanup_error:
-                self.logger.warning(f"Failed to cleanup {clone_path}: {cleanup_error}")
-            
+            if success:
+                self.record_backup(repo_data)
             return success
             
         except Exception as e:
             self.logger.error(f"Error backing up {repo_name}: {e}")
-            # Cleanup on error
-            try:
-                if clone_path.exists():
-                    shutil.rmtree(clone_path)
-            except Exception as cleanup_error:
-                self.logger.warning(f"Failed to cleanup {clone_path} after error: {cleanup_error}")
-            return False
             return False
     
     def run_backup(self, exclude_repos: Optional[Set[str]] = None, 
@@ -371,20 +740,20 @@ class GitHubOrgBackup:
         """Run the backup process."""
         exclude_repos = exclude_repos or set()
         
-        # Create clone directory
-        self.clone_dir.mkdir(exist_ok=True)
+        # Create clone directory once for all workers
+        self.clone_dir.mkdir(parents=True, exist_ok=True)
         
         try:
             # Get repositories from source organization
             repos = self.get_repositories(self.source_org, self.source_session)
             
-            # Filter repositories
-            if include_only:
-                repos = [r for r in repos if r['name'] in include_only]
-            
-            repos = [r for r in repos if r['name'] not in exclude_repos]
+            # Filter repositories in a single pass
+            repos = [
+                r for r in repos
+                if (not include_only or r['name'] in include_only) and r['name'] not in exclude_repos
+            ]
             
-            self.stats['total_repos'] = len(repos)
+            self._total = len(repos)
             
             if dry_run:
                 self.logger.info("DRY RUN - Repositories that would be backed up:")
@@ -399,6 +768,14 @@ class GitHubOrgBackup:
             
             self.logger.info(f"Starting backup of {len(repos)} repositories...")
             
+            self.prefetch_existing_dest_repos([self.get_dest_repo_name(r['name']) for r in repos])
+            # Loaded even with --force, so the state of repositories outside
+            # this run is kept when the file is saved again
+            self.load_state()
+            if not self.force:
+                repos = self.skip_unchanged(repos)
+            repos = self.prefetch_create(repos)
+            
             # Process repositories with thread pool
             with ThreadPoolExecutor(max_workers=self.workers) as executor:
                 future_to_repo = {
@@ -410,13 +787,10 @@ class GitHubOrgBackup:
                     repo = future_to_repo[future]
                     try:
                         success = future.result()
-                        if success:
-                            self.stats['successful'] += 1
-                        else:
-                            self.stats['failed'] += 1
+                        self._counts['successful' if success else 'failed'] += 1
                     except Exception as e:
                         self.logger.error(f"Repository {repo['name']} generated an exception: {e}")
-                        self.stats['failed'] += 1
+                        self._counts['failed'] += 1
             
             self.print_summary()
             
@@ -424,20 +798,34 @@ class GitHubOrgBackup:
             self.logger.error(f"Backup process failed: {e}")
             raise
         finally:
-            # Cleanup clone directory if empty
+            self.save_state()
+            
+            # Cleanup clone directory if no repository was mirrored or locked
             if self.clone_dir.exists() and not any(self.clone_dir.iterdir()):
                 self.clone_dir.rmdir()
+            
+            # Detach from the root logger, then flush queued log records
+            logging.getLogger().removeHandler(self.queue_handler)
+            self.log_listener.stop()
+            for handler in self.log_listener.handlers:
+                handler.close()
     
     def print_summary(self):
         """Print backup summary statistics."""
         self.logger.info("=" * 50)
         self.logger.info("BACKUP SUMMARY")
         self.logger.info("=" * 50)
-        self.logger.info(f"Total repositories: {self.stats['total_repos']}")
-        self.logger.info(f"Successful: {self.stats['successful']}")
-        self.logger.info(f"Failed: {self.stats['failed']}")
-        if self.stats['total_repos'] > 0:
-            self.logger.info(f"Success rate: {(self.stats['successful'] / self.stats['total_repos'] * 100):.1f}%")
+        successful = self._counts['successful']
+        skipped = self._counts['skipped']
+        attempted = self._total - skipped
+        self.logger.info(f"Total repositories: {self._total}")
+        self.logger.info(f"Successful: {successful}")
+        self.logger.info(f"Skipped (unchanged): {skipped}")
+        self.logger.info(f"Failed: {self._counts['failed']}")
+        if attempted > 0:
+            self.logger.info(f"Success rate: {(successful / attempted * 100):.1f}%")
+        elif self._total > 0:
+            self.logger.info("Success rate: N/A (all repositories unchanged)")
         else:
             self.logger.info("Success rate: N/A (no repositories found)")
 
@@ -454,8 +842,8 @@ def load_config(config_file: str) -> Dict:
         sys.exit(1)
 
 
-def main():
-    """Main entry point."""
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
     parser = argparse.ArgumentParser(
         description="Backup all repositories from one GitHub organization to another",
         epilog="""
@@ -495,13 +883,21 @@ Examples:
     parser.add_argument('--include-only',
                        help='Comma-separated list of repositories to include only')
     parser.add_argument('--clone-dir', default='./temp_clones',
-                       help='Directory for temporary clones (default: ./temp_clones)')
+                       help='Directory for local repository mirrors, kept between runs (default: ./temp_clones)')
+    parser.add_argument('--cache-dir', default=None,
+                       help='Directory for cached API responses (default: ~/.cache/gh-org-backup)')
     parser.add_argument('--workers', type=int, default=3,
                        help='Number of parallel workers (default: 3)')
+    parser.add_argument('--api-concurrency', type=int, default=None,
+                       help='Maximum number of concurrent GitHub API requests (default: 10)')
     parser.add_argument('--repo-prefix', default='',
                        help='Prefix to add to repository names in destination org')
     parser.add_argument('--include-date-prefix', action='store_true',
                        help='Include current date (YYYYMMDD) as prefix')
+    parser.add_argument('--state-file', default=None,
+                       help='File recording the last backed up state of each repository (default: ./backup_state.json)')
+    parser.add_argument('--force', action='store_true',
+                       help='Back up every repository, even those unchanged since the last backup')
     parser.add_argument('--config', default='config.json',
                        help='Configuration file (default: config.json)')
     parser.add_argument('--use-oauth', action='store_true',
@@ -510,8 +906,14 @@ Examples:
                        help='OAuth configuration file (default: oauth_config.json)')
     parser.add_argument('--use-gh-auth', action='store_true',
                        help='Use GitHub CLI (gh) authentication (recommended)')
-    
-    args = parser.parse_args()
+    parser.add_argument('--no-token-cache', action='store_true',
+                       help='Do not cache the GitHub CLI token between invocations')
+    return parser
+
+
+def main():
+    """Main entry point."""
+    args = build_parser().parse_args()
     
     # Load configuration
     config = load_config(args.config)
@@ -543,7 +945,7 @@ Examples:
             from gh_auth import GitHubCLIAuth
             
             print("🔐 Using GitHub CLI authentication...")
-            gh_auth = GitHubCLIAuth()
+            gh_auth = GitHubCLIAuth(use_token_cache=not args.no_token_cache)
             
             # Check if already authenticated
             auth_status = gh_auth.check_gh_auth_status()
@@ -605,7 +1007,11 @@ Examples:
         include_private=args.include_private or config.get('include_private', False),
         workers=args.workers or config.get('workers', 3),
         repo_prefix=args.repo_prefix or config.get('repo_prefix', ''),
-        include_date_prefix=args.include_date_prefix or config.get('include_date_prefix', False)
+        include_date_prefix=args.include_date_prefix or config.get('include_date_prefix', False),
+        cache_dir=args.cache_dir or config.get('cache_dir', '~/.cache/gh-org-backup'),
+        api_concurrency=args.api_concurrency or config.get('api_concurrency', 10),
+        state_file=args.state_file or config.get('state_file', './backup_state.json'),
+        force=args.force
     )
     
     try:
@@ -4,24 +4,109 @@ Cleanup script to delete backup repositories from destination organization.
 """
 
 import argparse
+import asyncio
+import importlib.util
 import json
 import logging
+import operator
 import os
+import sqlite3
 import sys
-from typing import List
+import threading
+import time
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Generator, Iterator, List, Optional, Tuple
 
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from json_utils import json_loads
+
+try:
+    import aiohttp
+except ImportError:  # Optional dependency, only needed for --async
+    aiohttp = None
+
+try:
+    import httpx
+except ImportError:  # Optional dependency, only needed for --http2
+    httpx = None
+
+# Exceptions raised by the synchronous HTTP clients
+HTTP_ERRORS = (requests.exceptions.RequestException,) + ((httpx.HTTPError,) if httpx else ())
+
+# Client-side ceiling on DELETE requests per second, kept below GitHub's
+# secondary rate limit so requests are spaced out instead of rejected
+DELETE_RATE_LIMIT = 80
+
+# Maximum number of connections opened by the async client
+ASYNC_CONNECTION_LIMIT = 32
+
+# Cached REST listing pages: {page URL: [ETag, [{name, private, id}, ...]]}
+ETAG_CACHE_FILE = Path('~/.cache/gh-org-backup/cleanup-etags.json').expanduser()
+
+# Log of deleted repositories, used to skip them when a cleanup is re-run
+DELETED_LOG_FILE = Path('~/.cache/gh-org-backup/cleanup.db').expanduser()
+
+# Number of deletions written to the log per transaction
+DELETED_LOG_BATCH = 50
+
+# Search API limits: results reachable through paging, and spacing
+# between requests to stay within 30 requests per minute
+SEARCH_RESULT_LIMIT = 1000
+SEARCH_REQUEST_INTERVAL = 2.0
+
+# GraphQL query listing an organization's repositories, 100 per page
+REPOSITORIES_QUERY = """
+query($org: String!, $cursor: String) {
+  organization(login: $org) {
+    repositories(first: 100, after: $cursor) {
+      nodes { name isPrivate databaseId }
+      pageInfo { endCursor hasNextPage }
+    }
+  }
+}
+"""
+
+
+class TokenBucket:
+    """Thread-safe token bucket that spaces out requests to a fixed rate."""
+    
+    def __init__(self, rate: float):
+        self.rate = rate
+        self._tokens = rate
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def reserve(self) -> float:
+        """Take a token and return how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            # A negative balance is the backlog queued ahead of this request
+            return max(0.0, -self._tokens / self.rate)
+
 
 class GitHubCleanup:
     """Class for cleaning up backup repositories from GitHub organization."""
     
-    def __init__(self, org: str, token: str, prefix: str = ""):
+    def __init__(self, org: str, token: str, prefix: str = "", concurrency: int = 16,
+                 use_async: bool = False, use_search: bool = False, http2: bool = False):
         self.org = org
         self.token = token
         self.prefix = prefix
+        self.concurrency = concurrency
+        self.use_async = use_async
+        self.use_search = use_search
+        self.headers = {
+            'Authorization': f'token {self.token}',
+            'Accept': 'application/vnd.github.v3+json'
+        }
         
         # Setup logging
         logging.basicConfig(
@@ -32,24 +117,185 @@ class GitHubCleanup:
         
         # Setup HTTP session with retries
         self.session = requests.Session()
-        retry_strategy = Retry(
+        # Honour the server's Retry-After instead of blind exponential backoff
+        retry_options = dict(
             total=3,
-            backoff_factor=1,
-            status_forcelist=[429, 500, 502, 503, 504],
+            backoff_factor=0.5,
+            status_forcelist=[429, 502, 503, 504],
+            allowed_methods=frozenset(['GET', 'DELETE']),
+            respect_retry_after_header=True,
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        try:
+            retry_strategy = Retry(backoff_jitter=0.5, **retry_options)
+        except TypeError:  # backoff_jitter needs urllib3 >= 2
+            retry_strategy = Retry(**retry_options)
+        adapter = HTTPAdapter(pool_maxsize=self.concurrency, max_retries=retry_strategy)
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
-        self.session.headers.update({
-            'Authorization': f'token {self.token}',
-            'Accept': 'application/vnd.github.v3+json'
-        })
+        self.session.headers.update(self.headers)
+        
+        # Client used for API calls: the requests session, or an HTTP/2 client
+        # that multiplexes concurrent requests over a single connection
+        self.client = self.session
+        if http2:
+            # Transport retries cover connection failures only
+            transport = httpx.HTTPTransport(
+                http2=True,
+                retries=3,
+                limits=httpx.Limits(max_connections=self.concurrency)
+            )
+            self.client = httpx.Client(headers=self.headers, timeout=30, transport=transport)
+        
+        # Epoch time until which the primary rate limit is exhausted
+        self._rate_limit_reset = 0
+        # Earliest monotonic time for the next search request
+        self._next_search_time = 0.0
+        # Shared by the threaded and async deletion paths
+        self.delete_limiter = TokenBucket(DELETE_RATE_LIMIT)
+        # Set when a listing stopped on an error, so some repositories were not seen
+        self.listing_incomplete = False
     
-    def get_repositories(self) -> List[dict]:
-        """Get all repositories from the organization that match the prefix."""
-        repos = []
+    def _filter_by_prefix(self, repos: List[dict]) -> List[dict]:
+        """Return the repositories whose name starts with the prefix."""
+        get_name = operator.itemgetter('name')
+        prefix = self.prefix
+        return [repo for repo in repos if get_name(repo).startswith(prefix)]
+    
+    def iter_repositories(self) -> Iterator[dict]:
+        """Yield repositories from the organization that match the prefix, page by page.
+        
+        Uses the search API when enabled, otherwise GraphQL, and falls back to
+        the REST listing when the token cannot be used for GraphQL queries.
+        """
+        self.listing_incomplete = False
+        
+        if self.use_search:
+            if (yield from self._iter_search_repositories()):
+                return
+            self.logger.info("Too many search results, falling back to organization listing")
+        
+        if not (yield from self._iter_repositories_graphql()):
+            self.logger.info("GraphQL listing unavailable, falling back to REST API")
+            yield from self._iter_repositories_rest()
+    
+    def _iter_search_repositories(self) -> Generator[dict, None, bool]:
+        """Yield matching repositories found through the search API.
+        
+        Only repositories whose name contains the prefix are returned by the
+        server. Returns False, before yielding anything, when the search
+        matches more than the API can page through.
+        """
+        url = "https://api.github.com/search/repositories"
+        params = {'q': f"org:{self.org} {self.prefix} in:name", 'per_page': 100}
+        page = 1
+        
+        while url:
+            # Stay under the search API's per-minute request limit
+            delay = self._next_search_time - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_search_time = time.monotonic() + SEARCH_REQUEST_INTERVAL
+            
+            try:
+                response = self.client.get(url, params=params)
+                response.raise_for_status()
+                result = json_loads(response.content)
+            except HTTP_ERRORS as e:
+                self.logger.error(f"Error searching repositories: {e}")
+                self.listing_incomplete = True
+                return True
+            
+            # Only checked before anything was yielded, so the fallback
+            # listing never repeats repositories
+            if page == 1 and result['total_count'] > SEARCH_RESULT_LIMIT:
+                return False
+            
+            # Search also matches the prefix inside names, so filter exactly
+            filtered_repos = self._filter_by_prefix(result['items'])
+            self.logger.info(f"Found {len(filtered_repos)} backup repositories on page {page}")
+            yield from filtered_repos
+            
+            # The next link already carries the query parameters
+            url = response.links.get('next', {}).get('url')
+            params = None
+            page += 1
+        
+        return True
+    
+    def _iter_repositories_graphql(self) -> Generator[dict, None, bool]:
+        """Yield matching repositories through GraphQL, requesting only name and visibility.
+        
+        Returns False, before yielding anything, when GraphQL cannot be used
+        (e.g. the token is rejected). Errors on later pages stop the listing
+        and mark it incomplete instead, since falling back then would list
+        the repositories already yielded a second time.
+        """
+        url = "https://api.github.com/graphql"
+        cursor = None
+        page = 1
+        
+        while True:
+            try:
+                response = self.client.post(url, json={
+                    'query': REPOSITORIES_QUERY,
+                    'variables': {'org': self.org, 'cursor': cursor}
+                })
+                if response.status_code in (401, 403) and page == 1:
+                    return False
+                response.raise_for_status()
+                
+                organization = (json_loads(response.content).get('data') or {}).get('organization')
+                if organization is None:
+                    if page == 1:
+                        return False
+                    self.logger.error(f"Organization missing from GraphQL response on page {page}")
+                    self.listing_incomplete = True
+                    return True
+                
+            except HTTP_ERRORS as e:
+                self.logger.error(f"Error fetching repositories: {e}")
+                self.listing_incomplete = True
+                return True
+            
+            connection = organization['repositories']
+            filtered_repos = [
+                {'name': node['name'], 'private': node['isPrivate'], 'id': node['databaseId']}
+                for node in self._filter_by_prefix(connection['nodes'])
+            ]
+            self.logger.info(f"Found {len(filtered_repos)} backup repositories on page {page}")
+            yield from filtered_repos
+            
+            if not connection['pageInfo']['hasNextPage']:
+                return True
+            cursor = connection['pageInfo']['endCursor']
+            page += 1
+    
+    def _load_etag_cache(self) -> Dict[str, list]:
+        """Load cached listing pages keyed by page URL."""
+        try:
+            with open(ETAG_CACHE_FILE, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+    
+    def _save_etag_cache(self, cache: Dict[str, list]) -> None:
+        """Persist cached listing pages."""
+        try:
+            ETAG_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+            with open(ETAG_CACHE_FILE, 'w') as f:
+                json.dump(cache, f)
+        except OSError as e:
+            self.logger.debug(f"Could not write ETag cache {ETAG_CACHE_FILE}: {e}")
+    
+    def _iter_repositories_rest(self) -> Iterator[dict]:
+        """Yield matching repositories through the REST listing endpoint.
+        
+        Every page is requested with the ETag of its cached copy; a 304 Not
+        Modified response reuses the cache and costs no rate limit.
+        """
         page = 1
         per_page = 100
+        etag_cache = self._load_etag_cache()
         
         while True:
             url = f"https://api.github.com/orgs/{self.org}/repos"
@@ -58,97 +304,354 @@ class GitHubCleanup:
                 'per_page': per_page,
                 'type': 'all'
             }
+            page_url = f"{url}?{urllib.parse.urlencode(params)}"
+            cached = etag_cache.get(page_url)
+            headers = {'If-None-Match': cached[0]} if cached else {}
             
             try:
-                response = self.session.get(url, params=params)
-                response.raise_for_status()
+                response = self.client.get(url, params=params, headers=headers)
+                
+                if response.status_code == 304:
+                    page_repos = cached[1]
+                else:
+                    response.raise_for_status()
+                    # Only names and visibility are needed, so only those are cached
+                    page_repos = [
+                        {'name': repo['name'], 'private': repo['private'], 'id': repo['id']}
+                        for repo in json_loads(response.content)
+                    ]
+                    if response.headers.get('ETag'):
+                        etag_cache[page_url] = [response.headers['ETag'], page_repos]
                 
-                page_repos = response.json()
                 if not page_repos:
                     break
                 
                 # Filter repositories by prefix
-                filtered_repos = [
-                    repo for repo in page_repos 
-                    if repo['name'].startswith(self.prefix)
-                ]
-                repos.extend(filtered_repos)
+                filtered_repos = self._filter_by_prefix(page_repos)
                 
                 self.logger.info(f"Found {len(filtered_repos)} backup repositories on page {page}")
                 page += 1
                 
-            except requests.exceptions.RequestException as e:
+            except HTTP_ERRORS as e:
                 self.logger.error(f"Error fetching repositories: {e}")
-                return []
+                self.listing_incomplete = True
+                return
+            
+            yield from filtered_repos
+        
+        self._save_etag_cache(etag_cache)
+    
+    def _last_page(self, response) -> int:
+        """Return the page number of a listing response's ``Link: rel="last"`` header."""
+        last_link = response.links.get('last', {}).get('url')
+        if not last_link:
+            return 1
+        query = urllib.parse.urlparse(last_link).query
+        return int(urllib.parse.parse_qs(query)['page'][0])
+    
+    def preview_repositories(self, limit: int = 10) -> Tuple[List[dict], int]:
+        """Return up to ``limit`` matching repositories and the organization's size.
+        
+        Only the first listing page is requested; the number of repositories
+        in the organization is estimated from its ``Link: rel="last"`` header.
+        """
+        url = f"https://api.github.com/orgs/{self.org}/repos"
+        per_page = 100
+        
+        try:
+            response = self.client.get(url, params={'page': 1, 'per_page': per_page, 'type': 'all'})
+            response.raise_for_status()
+            page_repos = json_loads(response.content)
+        except HTTP_ERRORS as e:
+            self.logger.error(f"Error fetching repositories: {e}")
+            return [], 0
+        
+        preview = [
+            {'name': repo['name'], 'private': repo['private']}
+            for repo in self._filter_by_prefix(page_repos)[:limit]
+        ]
+        
+        last_page = self._last_page(response)
+        estimate = last_page * per_page if last_page > 1 else len(page_repos)
+        return preview, estimate
+    
+    async def _get_repositories_async(self) -> List[dict]:
+        """Get matching repositories, fetching pages 2..N concurrently.
+        
+        Page 1 is fetched synchronously to read the page count from its
+        ``Link: rel="last"`` header.
+        """
+        url = f"https://api.github.com/orgs/{self.org}/repos"
+        params = {'per_page': '100', 'type': 'all'}
+        self.listing_incomplete = False
+        
+        try:
+            response = self.client.get(url, params={**params, 'page': '1'})
+            response.raise_for_status()
+            pages = [json_loads(response.content)]
+            
+            last_page = self._last_page(response)
+            
+            semaphore = asyncio.Semaphore(self.concurrency)
+            connector = aiohttp.TCPConnector(limit=ASYNC_CONNECTION_LIMIT)
+            
+            async with aiohttp.ClientSession(headers=self.headers, connector=connector) as client:
+                async def fetch_page(page: int) -> List[dict]:
+                    async with semaphore:
+                        async with client.get(url, params={**params, 'page': str(page)}) as page_response:
+                            page_response.raise_for_status()
+                            return json_loads(await page_response.read())
+                
+                pages.extend(await asyncio.gather(*(fetch_page(page) for page in range(2, last_page + 1))))
+                
+        except HTTP_ERRORS + (aiohttp.ClientError,) as e:
+            self.logger.error(f"Error fetching repositories: {e}")
+            self.listing_incomplete = True
+            return []
+        
+        repos = []
+        for page, page_repos in enumerate(pages, start=1):
+            # Filter repositories by prefix
+            filtered_repos = self._filter_by_prefix(page_repos)
+            repos.extend(filtered_repos)
+            self.logger.info(f"Found {len(filtered_repos)} backup repositories on page {page}")
         
         return repos
     
+    def _check_delete_status(self, repo_name: str, status_code: int) -> bool:
+        """Log the outcome of a DELETE request and return whether it succeeded."""
+        if status_code == 204:
+            self.logger.info(f"✅ Deleted repository: {repo_name}")
+            return True
+        elif status_code == 404:
+            self.logger.warning(f"⚠️  Repository not found: {repo_name}")
+            return True  # Consider as success since it's already gone
+        else:
+            self.logger.error(f"❌ Failed to delete {repo_name}: {status_code}")
+            return False
+    
+    def _rate_limit_delay(self, headers) -> float:
+        """Return how long to wait if a response reports an exhausted rate limit."""
+        if headers.get('X-RateLimit-Remaining') != '0':
+            return 0
+        reset = int(headers.get('X-RateLimit-Reset', 0))
+        return max(0, reset - time.time())
+    
     def delete_repository(self, repo_name: str) -> bool:
         """Delete a repository from the organization."""
         url = f"https://api.github.com/repos/{self.org}/{repo_name}"
         
         try:
-            response = self.session.delete(url)
+            # Wait out an exhausted rate limit reported by an earlier response
+            delay = self._rate_limit_reset - time.time()
+            if delay > 0:
+                self.logger.warning(f"Rate limit reached. Waiting {delay:.0f} seconds...")
+                time.sleep(delay)
             
-            if response.status_code == 204:
-                self.logger.info(f"✅ Deleted repository: {repo_name}")
-                return True
-            elif response.status_code == 404:
-                self.logger.warning(f"⚠️  Repository not found: {repo_name}")
-                return True  # Consider as success since it's already gone
-            else:
-                self.logger.error(f"❌ Failed to delete {repo_name}: {response.status_code}")
-                return False
+            time.sleep(self.delete_limiter.reserve())
+            response = self.client.delete(url)
+            delay = self._rate_limit_delay(response.headers)
+            if delay:
+                self._rate_limit_reset = max(self._rate_limit_reset, time.time() + delay)
+            return self._check_delete_status(repo_name, response.status_code)
                 
-        except requests.exceptions.RequestException as e:
+        except HTTP_ERRORS as e:
             self.logger.error(f"❌ Error deleting {repo_name}: {e}")
             return False
     
-    def cleanup_backups(self, dry_run: bool = False) -> None:
-        """Clean up all backup repositories."""
-        repos = self.get_repositories()
-        
-        if not repos:
-            self.logger.info("No backup repositories found to clean up")
+    def _open_deleted_log(self) -> Optional[sqlite3.Connection]:
+        """Open the log of deleted repositories, or return None if it is unavailable."""
+        try:
+            DELETED_LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(DELETED_LOG_FILE)
+            db.execute(
+                "CREATE TABLE IF NOT EXISTS deleted("
+                "org TEXT, name TEXT, id INTEGER, ts INTEGER, PRIMARY KEY(org, name))"
+            )
+            return db
+        except (OSError, sqlite3.Error) as e:
+            self.logger.warning(f"Could not open deleted log {DELETED_LOG_FILE}: {e}")
+            return None
+    
+    def _record_deleted(self, db: Optional[sqlite3.Connection], repos: List[dict]) -> None:
+        """Add deleted repositories to the log in one transaction."""
+        if db is None or not repos:
             return
+        now = int(time.time())
+        try:
+            with db:
+                db.executemany(
+                    "INSERT OR REPLACE INTO deleted(org, name, id, ts) VALUES (?, ?, ?, ?)",
+                    [(self.org, repo['name'], repo.get('id'), now) for repo in repos]
+                )
+        except sqlite3.Error as e:
+            self.logger.warning(f"Could not update deleted log: {e}")
+    
+    async def _delete_repositories_async(self, repo_names: List[str]) -> List[bool]:
+        """Delete repositories concurrently on a single aiohttp session."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+        connector = aiohttp.TCPConnector(limit=ASYNC_CONNECTION_LIMIT)
+        # Cleared while the rate limit is exhausted; every task waits on it
+        rate_limit_ok = asyncio.Event()
+        rate_limit_ok.set()
         
-        self.logger.info(f"Found {len(repos)} backup repositories to delete")
-        
-        if dry_run:
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector) as client:
+            async def delete(repo_name: str) -> bool:
+                url = f"https://api.github.com/repos/{self.org}/{repo_name}"
+                try:
+                    async with semaphore:
+                        await rate_limit_ok.wait()
+                        await asyncio.sleep(self.delete_limiter.reserve())
+                        async with client.delete(url) as response:
+                            status = response.status
+                            delay = self._rate_limit_delay(response.headers)
+                        
+                        if delay and rate_limit_ok.is_set():
+                            rate_limit_ok.clear()
+                            self.logger.warning(f"Rate limit reached. Waiting {delay:.0f} seconds...")
+                            await asyncio.sleep(delay)
+                            rate_limit_ok.set()
+                    return self._check_delete_status(repo_name, status)
+                except aiohttp.ClientError as e:
+                    self.logger.error(f"❌ Error deleting {repo_name}: {e}")
+                    return False
+            
+            return await asyncio.gather(*(delete(name) for name in repo_names))
+    
+    def _list_repositories(self) -> List[dict]:
+        """List every matching repository with the configured listing method."""
+        if self.use_async:
+            return asyncio.run(self._get_repositories_async())
+        return list(self.iter_repositories())
+    
+    def _dry_run(self) -> None:
+        """Log the repositories a cleanup would delete."""
+        # Only the plain REST listing can be estimated from its first page
+        if self.use_async and not self.use_search:
+            preview, org_size = self.preview_repositories()
+            more_pages = org_size > 100
+            if not preview and not more_pages:
+                self.logger.info("No backup repositories found on the first listing page")
+                return
             self.logger.info("DRY RUN - Repositories that would be deleted:")
-            for repo in repos:
+            for repo in preview:
                 self.logger.info(f"  - {repo['name']} ({'private' if repo['private'] else 'public'})")
+            if more_pages:
+                self.logger.info(f"  ... and possibly more among ~{org_size} repositories in the organization")
             return
         
-        # Ask for confirmation
-        print(f"\n🚨 WARNING: This will delete {len(repos)} repositories from the '{self.org}' organization!")
-        print("Repositories to be deleted:")
-        for repo in repos[:10]:  # Show first 10
-            print(f"  - {repo['name']}")
-        if len(repos) > 10:
-            print(f"  ... and {len(repos) - 10} more")
-        
-        confirm = input("\nAre you sure you want to proceed? Type 'DELETE' to confirm: ")
-        if confirm != 'DELETE':
-            print("❌ Cleanup cancelled")
+        repos = self._list_repositories()
+        if self.listing_incomplete:
+            self.logger.warning("Repository listing stopped early; the list below is incomplete")
+        if not repos:
+            self.logger.info("No backup repositories found to clean up")
             return
+        self.logger.info(f"DRY RUN - {len(repos)} repositories would be deleted:")
+        for repo in repos:
+            self.logger.info(f"  - {repo['name']} ({'private' if repo['private'] else 'public'})")
+    
+    def cleanup_backups(self, dry_run: bool = False) -> None:
+        """Clean up all backup repositories.
         
-        successful = 0
-        failed = 0
+        The organization is listed in full before the confirmation prompt,
+        so the prompt shows exactly what will be deleted.
+        """
+        if dry_run:
+            self._dry_run()
+            return
         
-        for repo in repos:
-            if self.delete_repository(repo['name']):
-                successful += 1
+        # List everything before deleting: the REST and search listings page
+        # by offset, so deleting while paging would shift unread repositories
+        # onto pages that were already fetched
+        repos = self._list_repositories()
+        
+        # Skip repositories an earlier run already deleted. Matching on the id
+        # keeps a repository recreated under the same name from being skipped.
+        db = self._open_deleted_log()
+        try:
+            deleted_ids = dict(db.execute("SELECT name, id FROM deleted WHERE org = ?", (self.org,))) if db else {}
+            listed = len(repos)
+            repos = [
+                repo for repo in repos
+                if repo.get('id') is None or deleted_ids.get(repo['name']) != repo['id']
+            ]
+            if listed > len(repos):
+                self.logger.info(f"Skipped {listed - len(repos)} repositories deleted in an earlier run")
+            
+            if not repos:
+                if self.listing_incomplete:
+                    self.logger.warning("Repository listing stopped early; nothing was deleted")
+                else:
+                    self.logger.info("No backup repositories found to clean up")
+                return
+            
+            # Ask for confirmation
+            if self.prefix:
+                target = f"repositories starting with '{self.prefix}'"
             else:
-                failed += 1
+                target = "repositories (every repository in the organization: --prefix is empty)"
+            print(f"\n🚨 WARNING: This will delete {len(repos)} {target} from the '{self.org}' organization!")
+            if self.listing_incomplete:
+                print("⚠️  The listing stopped early, so only the repositories found so far will be deleted")
+            print("Repositories to be deleted:")
+            for repo in repos[:10]:  # Show first 10
+                print(f"  - {repo['name']}")
+            if len(repos) > 10:
+                print(f"  ... and {len(repos) - 10} more")
+            
+            confirm = input("\nAre you sure you want to proceed? Type 'DELETE' to confirm: ")
+            if confirm != 'DELETE':
+                print("❌ Cleanup cancelled")
+                return
+            
+            successful, failed = self._delete_repositories(repos, db)
+        finally:
+            if db is not None:
+                db.close()
+        
+        total = successful + failed
+        if self.listing_incomplete:
+            self.logger.warning("Repository listing stopped early; run the cleanup again to delete the rest")
         
         self.logger.info("=" * 50)
         self.logger.info("CLEANUP SUMMARY")
         self.logger.info("=" * 50)
-        self.logger.info(f"Total repositories: {len(repos)}")
+        self.logger.info(f"Total repositories: {total}")
         self.logger.info(f"Successfully deleted: {successful}")
         self.logger.info(f"Failed: {failed}")
-        self.logger.info(f"Success rate: {(successful/len(repos)*100):.1f}%")
+        self.logger.info(f"Success rate: {(successful/total*100):.1f}%")
+    
+    def _delete_repositories(self, repos: List[dict], db: Optional[sqlite3.Connection]) -> Tuple[int, int]:
+        """Delete repositories and log them; return the success and failure counts."""
+        successful = 0
+        failed = 0
+        
+        # Deletions are independent, so issue them concurrently
+        if self.use_async:
+            results = asyncio.run(self._delete_repositories_async([repo['name'] for repo in repos]))
+            successful = sum(results)
+            failed = len(results) - successful
+            self._record_deleted(db, [repo for repo, ok in zip(repos, results) if ok])
+        else:
+            pending = []
+            with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+                futures = {
+                    executor.submit(self.delete_repository, repo['name']): repo
+                    for repo in repos
+                }
+                
+                for future in as_completed(futures):
+                    if future.result():
+                        successful += 1
+                        pending.append(futures[future])
+                        if len(pending) >= DELETED_LOG_BATCH:
+                            self._record_deleted(db, pending)
+                            pending = []
+                    else:
+                        failed += 1
+            self._record_deleted(db, pending)
+        
+        return successful, failed
 
 
 def main():
@@ -164,18 +667,37 @@ def main():
                        help='Prefix of repositories to delete (default: 20250829-backup-)')
     parser.add_argument('--use-gh-auth', action='store_true',
                        help='Use GitHub CLI authentication')
+    parser.add_argument('--no-token-cache', action='store_true',
+                       help='Do not cache the GitHub CLI token between invocations')
     parser.add_argument('--dry-run', action='store_true',
                        help='Show what would be deleted without actually deleting')
+    parser.add_argument('--concurrency', type=int, default=16,
+                       help='Number of repositories deleted in parallel (default: 16)')
+    parser.add_argument('--async', dest='use_async', action='store_true',
+                       help='Use asyncio/aiohttp for listing and deletion (requires aiohttp)')
+    parser.add_argument('--use-search', action='store_true',
+                       help='Find repositories with the search API (faster when backups are a small part of the org)')
+    parser.add_argument('--http2', action='store_true',
+                       help='Multiplex API requests over one HTTP/2 connection (requires httpx[http2])')
     
     args = parser.parse_args()
     
+    if args.use_async and aiohttp is None:
+        print("❌ --async requires aiohttp. Install it with: pip install aiohttp")
+        sys.exit(1)
+    
+    # httpx only imports h2 when an HTTP/2 transport is created
+    if args.http2 and (httpx is None or importlib.util.find_spec('h2') is None):
+        print("❌ --http2 requires httpx with HTTP/2 support. Install it with: pip install 'httpx[http2]'")
+        sys.exit(1)
+    
     # Get token
     if args.use_gh_auth:
         try:
             from gh_auth import GitHubCLIAuth
             
             print("🔐 Using GitHub CLI authentication...")
-            gh_auth = GitHubCLIAuth()
+            gh_auth = GitHubCLIAuth(use_token_cache=not args.no_token_cache)
             
             auth_status = gh_auth.check_gh_auth_status()
             if auth_status.get('authenticated'):
@@ -206,7 +728,11 @@ def main():
     cleanup = GitHubCleanup(
         org=args.org,
         token=token,
-        prefix=args.prefix
+        prefix=args.prefix,
+        concurrency=args.concurrency,
+        use_async=args.use_async,
+        use_search=args.use_search,
+        http2=args.http2
     )
     
     try:
@@ -6,6 +6,24 @@ Debug script to test GitHub API access
 import json
 import requests
 import sys
+from requests.adapters import HTTPAdapter
+
+from json_utils import json_loads
+
+BASE_URL = 'https://api.github.com'
+
+
+def _get_json(session, url, **kw):
+    """GET a URL and return its status code, decoded body and headers.
+    
+    The body is returned as text when it is not JSON.
+    """
+    response = session.get(url, **kw)
+    try:
+        data = json_loads(response.content)
+    except ValueError:
+        data = response.text
+    return response.status_code, data, response.headers
 
 
 def test_github_access():
@@ -36,17 +54,21 @@ def test_github_access():
         'User-Agent': 'GitHub-Org-Backup-Debug/1.0'
     }
     
+    # One session for all checks so the TLS connection is reused
+    session = requests.Session()
+    session.headers.update(headers)
+    session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10))
+    
     print("\n1️⃣ Testing authentication...")
     try:
-        auth_response = requests.get('https://api.github.com/user', headers=headers)
-        print(f"   Status: {auth_response.status_code}")
+        auth_status, user_data, auth_headers = _get_json(session, f'{BASE_URL}/user')
+        print(f"   Status: {auth_status}")
         
-        if auth_response.status_code == 200:
-            user_data = auth_response.json()
+        if auth_status == 200:
             print(f"   ✅ Authenticated as: {user_data.get('login')}")
             print(f"   Account type: {user_data.get('type')}")
         else:
-            print(f"   ❌ Authentication failed: {auth_response.text}")
+            print(f"   ❌ Authentication failed: {user_data}")
             return False
     except Exception as e:
         print(f"   ❌ Authentication error: {e}")
@@ -54,14 +76,13 @@ def test_github_access():
     
     print(f"\n2️⃣ Testing organization access for: {source_org}")
     try:
-        org_response = requests.get(f'https://api.github.com/orgs/{source_org}', headers=headers)
-        print(f"   Status: {org_response.status_code}")
+        org_status, org_data, _ = _get_json(session, f'{BASE_URL}/orgs/{source_org}')
+        print(f"   Status: {org_status}")
         
-        if org_response.status_code == 200:
-            org_data = org_response.json()
+        if org_status == 200:
             print(f"   ✅ Organization found: {org_data.get('name', org_data.get('login'))}")
             print(f"   Public repos: {org_data.get('public_repos', 'unknown')}")
-        elif org_response.status_code == 404:
+        elif org_status == 404:
             print(f"   ❌ Organization '{source_org}' not found or not accessible")
             print("   💡 Check if:")
             print("      - Organization name is spelled correctly")
@@ -69,7 +90,7 @@ def test_github_access():
             print("      - Organization exists and is accessible")
             return False
         else:
-            print(f"   ❌ Organization access failed: {org_response.text}")
+            print(f"   ❌ Organization access failed: {org_data}")
             return False
     except Exception as e:
         print(f"   ❌ Organization access error: {e}")
@@ -78,29 +99,27 @@ def test_github_access():
     print(f"\n3️⃣ Testing repository listing for: {source_org}")
     try:
         # Test public repos first
-        repos_url = f'https://api.github.com/orgs/{source_org}/repos'
+        repos_url = f'{BASE_URL}/orgs/{source_org}/repos'
         params = {'type': 'public', 'per_page': 10}
         
-        repos_response = requests.get(repos_url, headers=headers, params=params)
-        print(f"   Public repos status: {repos_response.status_code}")
+        repos_status, public_repos, _ = _get_json(session, repos_url, params=params)
+        print(f"   Public repos status: {repos_status}")
         
-        if repos_response.status_code == 200:
-            public_repos = repos_response.json()
+        if repos_status == 200:
             print(f"   ✅ Found {len(public_repos)} public repositories")
             for repo in public_repos[:3]:  # Show first 3
                 print(f"      - {repo['name']} ({repo['visibility']})")
             if len(public_repos) > 3:
                 print(f"      ... and {len(public_repos) - 3} more")
         else:
-            print(f"   ❌ Public repos access failed: {repos_response.text}")
+            print(f"   ❌ Public repos access failed: {public_repos}")
         
         # Test all repos (including private)
         params['type'] = 'all'
-        all_repos_response = requests.get(repos_url, headers=headers, params=params)
-        print(f"   All repos status: {all_repos_response.status_code}")
+        all_repos_status, all_repos, _ = _get_json(session, repos_url, params=params)
+        print(f"   All repos status: {all_repos_status}")
         
-        if all_repos_response.status_code == 200:
-            all_repos = all_repos_response.json()
+        if all_repos_status == 200:
             print(f"   ✅ Found {len(all_repos)} total repositories (public + private)")
             
             private_count = sum(1 for repo in all_repos if repo.get('private', False))
@@ -114,10 +133,10 @@ def test_github_access():
                     visibility = "private" if repo.get('private') else "public"
                     print(f"      - {repo['name']} ({visibility})")
             
-        elif all_repos_response.status_code == 403:
+        elif all_repos_status == 403:
             print("   ⚠️  Access to private repos denied (check token permissions)")
         else:
-            print(f"   ❌ All repos access failed: {all_repos_response.text}")
+            print(f"   ❌ All repos access failed: {all_repos}")
             
     except Exception as e:
         print(f"   ❌ Repository listing error: {e}")
@@ -126,7 +145,7 @@ def test_github_access():
     print(f"\n4️⃣ Checking token permissions...")
     try:
         # Check token scopes
-        scopes = auth_response.headers.get('X-OAuth-Scopes', '').split(', ')
+        scopes = auth_headers.get('X-OAuth-Scopes', '').split(', ')
         print(f"   Token scopes: {scopes}")
         
         required_scopes = ['repo'] if config.get('include_private') else ['public_repo']
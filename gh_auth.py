@@ -4,36 +4,112 @@ GitHub CLI Authentication Module for GitHub Organization Backup Tool
 """
 
 import json
+import os
+import re
+import shutil
 import subprocess
 import sys
+import time
 from typing import Optional, Dict
 
+import requests
+
+# Seconds a cached token is reused before asking gh again
+TOKEN_CACHE_TTL = 300
+
+# Seconds to wait for non-interactive gh commands (e.g. a locked keyring)
+GH_TIMEOUT = 10
+
+# Matches "Logged in to github.com as USER" (older gh) and
+# "Logged in to github.com account USER" (newer gh)
+_GH_STATUS_RE = re.compile(r'Logged in to github\.com (as|account) (\S+)')
+
+# Scopes header in the response head printed by `gh api -i`
+_GH_SCOPES_RE = re.compile(r'^X-Oauth-Scopes:[ \t]*(.*?)\r?$', re.IGNORECASE | re.MULTILINE)
+
+# Single GraphQL query covering every check in test_token_access
+TOKEN_ACCESS_QUERY = """
+query($org: String!) {
+  viewer { login name }
+  organization(login: $org) {
+    repositories(first: 5) {
+      totalCount
+      nodes { name isPrivate }
+    }
+  }
+}
+"""
+
 
 class GitHubCLIAuth:
     """GitHub CLI authentication handler."""
     
-    def __init__(self):
+    def __init__(self, use_token_cache: bool = True):
         self.gh_token = None
+        # Absolute path of the gh executable, or None if it is not installed
+        self._gh = shutil.which('gh')
+        # Shared by API checks so repeated calls reuse the connection
+        self._session = requests.Session()
+        
+        # Short-lived token cache in the per-user runtime directory (tmpfs on
+        # most systems); disabled when XDG_RUNTIME_DIR is not set
+        runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+        self._token_cache_dir = runtime_dir if use_token_cache else None
+        # Active github.com account, found by check_gh_auth_status(); the
+        # cache is only used once it is known, and is keyed by it
+        self._active_account = None
+    
+    @property
+    def token_cache_path(self) -> Optional[str]:
+        """Cache file for the active account's token, or None if caching is off."""
+        if not self._token_cache_dir or not self._active_account:
+            return None
+        return os.path.join(self._token_cache_dir, f'github-backup-token-github.com-{self._active_account}')
+    
+    def _read_cached_token(self) -> Optional[str]:
+        """Return the cached token if it was written within TOKEN_CACHE_TTL."""
+        try:
+            if time.time() - os.path.getmtime(self.token_cache_path) < TOKEN_CACHE_TTL:
+                with open(self.token_cache_path, 'r') as f:
+                    return f.read().strip() or None
+        except OSError:
+            pass
+        return None
+    
+    def _clear_cached_token(self) -> None:
+        """Remove the cached token, e.g. after logging in again."""
+        if self.token_cache_path:
+            try:
+                os.remove(self.token_cache_path)
+            except OSError:
+                pass
+    
+    def _write_cached_token(self, token: str) -> None:
+        """Cache the token, readable by the current user only."""
+        try:
+            fd = os.open(self.token_cache_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                f.write(token)
+        except OSError:
+            pass
     
     def check_gh_installed(self) -> bool:
         """Check if GitHub CLI is installed."""
-        try:
-            result = subprocess.run(['gh', '--version'], 
-                                  capture_output=True, text=True)
-            return result.returncode == 0
-        except FileNotFoundError:
-            return False
+        return self._gh is not None
     
     def check_gh_auth_status(self) -> Dict:
         """Check GitHub CLI authentication status."""
+        if self._gh is None:
+            return {'authenticated': False, 'error': 'GitHub CLI (gh) is not installed'}
+        
         try:
-            result = subprocess.run(['gh', 'auth', 'status'], 
-                                  capture_output=True, text=True)
+            result = subprocess.run([self._gh, 'auth', 'status'], 
+                                  capture_output=True, text=True, timeout=GH_TIMEOUT)
             
             if result.returncode == 0:
                 # Parse the output to get user info
-                output = result.stderr  # gh auth status outputs to stderr
-                lines = output.split('\n')
+                # Older gh writes the status to stderr, newer gh to stdout
+                output = result.stderr + result.stdout
                 
                 status = {
                     'authenticated': True,
@@ -42,13 +118,19 @@ class GitHubCLIAuth:
                     'account': None
                 }
                 
-                for line in lines:
-                    if 'Logged in to github.com as' in line:
-                        username = line.split('as')[1].strip().split()[0]
-                        status['username'] = username
-                    elif 'Logged in to github.com account' in line:
-                        account = line.split('account')[1].strip().split()[0]
-                        status['account'] = account
+                matches = list(_GH_STATUS_RE.finditer(output))
+                for m in matches:
+                    key = 'username' if m.group(1) == 'as' else 'account'
+                    status[key] = status[key] or m.group(2)
+                
+                # With several accounts, gh marks the one in use as active
+                self._active_account = matches[0].group(2) if matches else None
+                for i, m in enumerate(matches):
+                    block_end = matches[i + 1].start() if i + 1 < len(matches) else len(output)
+                    if 'Active account: true' in output[m.end():block_end]:
+                        self._active_account = m.group(2)
+                        status['account'] = m.group(2)
+                        break
                 
                 return status
             else:
@@ -65,13 +147,20 @@ class GitHubCLIAuth:
         print("🔐 Authenticating with GitHub CLI...")
         print("📋 This will request the following scopes:", ', '.join(scopes))
         
+        if self._gh is None:
+            print("❌ GitHub CLI (gh) is not installed")
+            return False
+        
         try:
             # Use gh auth login with specific scopes
-            cmd = ['gh', 'auth', 'login', '--scopes', ','.join(scopes)]
+            cmd = [self._gh, 'auth', 'login', '--scopes', ','.join(scopes)]
             result = subprocess.run(cmd, text=True)
             
             if result.returncode == 0:
                 print("✅ GitHub CLI authentication successful!")
+                # The login may have replaced the token or switched accounts
+                self._clear_cached_token()
+                self._active_account = None
                 return True
             else:
                 print("❌ GitHub CLI authentication failed")
@@ -82,14 +171,25 @@ class GitHubCLIAuth:
             return False
     
     def get_token(self) -> Optional[str]:
-        """Get GitHub token from GitHub CLI."""
+        """Get GitHub token from GitHub CLI, reusing a recently cached one."""
+        if self.token_cache_path:
+            token = self._read_cached_token()
+            if token:
+                return token
+        
+        if self._gh is None:
+            print("❌ GitHub CLI (gh) is not installed")
+            return None
+        
         try:
-            result = subprocess.run(['gh', 'auth', 'token'], 
-                                  capture_output=True, text=True)
+            result = subprocess.run([self._gh, 'auth', 'token'], 
+                                  capture_output=True, text=True, timeout=GH_TIMEOUT)
             
             if result.returncode == 0:
                 token = result.stdout.strip()
                 if token:
+                    if self.token_cache_path:
+                        self._write_cached_token(token)
                     return token
                 else:
                     print("❌ No token returned from GitHub CLI")
@@ -102,14 +202,23 @@ class GitHubCLIAuth:
             print(f"❌ Error getting token: {e}")
             return None
     
-    def test_token_access(self, token: str, org: str) -> Dict:
-        """Test token access to organization repositories."""
-        import requests
+    def test_token_access(self, token: str, org: str, session=None) -> Dict:
+        """Test token access to organization repositories.
+        
+        Runs a single ``gh api graphql`` query, and falls back to the REST API
+        when gh is unavailable. Pass a ``requests.Session`` to use for the
+        fallback instead of the instance's own.
+        """
+        results = self._test_token_access_gh(token, org)
+        if results is not None:
+            return results
         
         headers = {
             'Authorization': f'token {token}',
             'Accept': 'application/vnd.github.v3+json'
         }
+        if session is None:
+            session = self._session
         
         results = {
             'user_info': None,
@@ -120,7 +229,7 @@ class GitHubCLIAuth:
         
         try:
             # Test user info
-            user_response = requests.get('https://api.github.com/user', headers=headers)
+            user_response = session.get('https://api.github.com/user', headers=headers)
             if user_response.status_code == 200:
                 user_data = user_response.json()
                 results['user_info'] = {
@@ -134,7 +243,7 @@ class GitHubCLIAuth:
                 results['scopes'] = scopes.split(', ') if scopes else []
             
             # Test organization repository access
-            org_response = requests.get(f'https://api.github.com/orgs/{org}/repos?type=all&per_page=100', 
+            org_response = session.get(f'https://api.github.com/orgs/{org}/repos?type=all&per_page=100', 
                                       headers=headers)
             if org_response.status_code == 200:
                 repos = org_response.json()
@@ -147,6 +256,64 @@ class GitHubCLIAuth:
         
         return results
     
+    def _test_token_access_gh(self, token: str, org: str) -> Optional[Dict]:
+        """Test token access with one GraphQL query through gh.
+        
+        Returns None when gh cannot be run or gives no usable response.
+        """
+        if self._gh is None:
+            return None
+        
+        try:
+            result = subprocess.run(
+                [self._gh, 'api', 'graphql', '-i',
+                 '-f', f'query={TOKEN_ACCESS_QUERY}', '-f', f'org={org}'],
+                capture_output=True, text=True, timeout=GH_TIMEOUT,
+                env={**os.environ, 'GH_TOKEN': token}
+            )
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        
+        # -i prints the response head, a blank line, then the JSON body
+        parts = re.split(r'\r?\n\r?\n', result.stdout, maxsplit=1)
+        if len(parts) != 2:
+            return None
+        head, body = parts
+        try:
+            data = json.loads(body).get('data') or {}
+        except ValueError:
+            return None
+        
+        results = {
+            'user_info': None,
+            'org_access': False,
+            'repo_count': 0,
+            'scopes': []
+        }
+        
+        viewer = data.get('viewer')
+        if viewer:
+            results['user_info'] = {
+                'login': viewer['login'],
+                'type': 'User',
+                'name': viewer.get('name') or 'N/A'
+            }
+            scopes = _GH_SCOPES_RE.search(head)
+            if scopes and scopes.group(1):
+                results['scopes'] = scopes.group(1).split(', ')
+        
+        organization = data.get('organization')
+        if organization:
+            repositories = organization['repositories']
+            results['org_access'] = True
+            results['repo_count'] = repositories['totalCount']
+            results['repositories'] = [
+                {'name': node['name'], 'private': node['isPrivate']}
+                for node in repositories['nodes']
+            ]
+        
+        return results
+    
     def setup_auth(self, org: str) -> Optional[str]:
         """Complete GitHub CLI authentication setup."""
         print("🚀 GitHub CLI Authentication Setup")
@@ -221,9 +388,11 @@ def main():
     
     parser = argparse.ArgumentParser(description="GitHub CLI Authentication Setup")
     parser.add_argument('--org', required=True, help='GitHub organization to test access')
+    parser.add_argument('--no-token-cache', action='store_true',
+                       help='Do not cache the gh token between invocations')
     args = parser.parse_args()
     
-    gh_auth = GitHubCLIAuth()
+    gh_auth = GitHubCLIAuth(use_token_cache=not args.no_token_cache)
     token = gh_auth.setup_auth(args.org)
     
     if token:
@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+JSON helpers shared by the GitHub Organization Backup Tool scripts
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # Optional dependency, falls back to the json module
+    orjson = None
+
+
+def json_loads(data: bytes):
+    """Decode a JSON document, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps_pretty(obj) -> bytes:
+    """Encode an object as indented UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+    return json.dumps(obj, indent=2).encode('utf-8')
@@ -5,67 +5,145 @@ OAuth Authentication Module for GitHub Organization Backup Tool
 
 import base64
 import hashlib
-import json
+import hmac
 import os
 import secrets
 import socket
 import subprocess
 import sys
-import time
 import urllib.parse
 import webbrowser
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from threading import Thread
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Event, Thread
 from typing import Dict, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from json_utils import json_dumps_pretty, json_loads
+
+# File holding the OAuth app credentials and access token
+OAUTH_CONFIG_FILE = 'oauth_config.json'
+
+# Page shown in the browser after a successful callback, encoded once
+_SUCCESS_HTML = """
+<html>
+<head><title>GitHub OAuth Success</title></head>
+<body>
+    <h2>✅ Authentication Successful!</h2>
+    <p>You can close this window and return to the terminal.</p>
+    <script>setTimeout(function(){ window.close(); }, 3000);</script>
+</body>
+</html>
+""".encode('utf-8')
+_SUCCESS_HEADERS = [
+    ('Content-Type', 'text/html; charset=utf-8'),
+    ('Content-Length', str(len(_SUCCESS_HTML)))
+]
+
+# Host of the callback URL registered with the OAuth app
+REDIRECT_HOST = os.getenv('GITHUB_OAUTH_REDIRECT_HOST', 'localhost')
+
+# GitHub accepts a redirect to a different port than the registered callback
+# URL only when its host is this loopback IP literal
+LOOPBACK_IP = '127.0.0.1'
+
+# Number of ports after redirect_port tried when it is already in use
+# (only with a LOOPBACK_IP redirect host)
+REDIRECT_PORT_ATTEMPTS = 5
+
+
+class CallbackServer(ThreadingHTTPServer):
+    """Callback server that rebinds a port in TIME_WAIT and handles each
+    connection on its own thread, so an idle browser connection or a favicon
+    request cannot hold up the callback."""
+    allow_reuse_address = True
+    daemon_threads = True
 
 
 class GitHubOAuth:
     """GitHub OAuth authentication handler."""
     
-    def __init__(self, client_id: str, client_secret: str, redirect_port: int = 8080):
+    def __init__(self, client_id: str, client_secret: str, redirect_port: int = 8080,
+                 redirect_host: str = REDIRECT_HOST):
         self.client_id = client_id
         self.client_secret = client_secret
-        self.redirect_port = redirect_port
-        self.redirect_uri = f"http://localhost:{redirect_port}/callback"
+        self.redirect_host = redirect_host
+        self._set_redirect_port(redirect_port)
         self.access_token = None
         self.auth_code = None
         self.state = None
+        # Set by the callback handler once the authorization redirect arrives
+        self.auth_event = Event()
+        # Set when the user interrupts the wait for the callback
+        self.cancelled = False
+        
+        # One pooled session for the token exchange and API calls; POST is
+        # not retried since an authorization code can only be used once
+        self.session = requests.Session()
+        self.session.headers.update({'Accept': 'application/vnd.github.v3+json'})
+        retry_strategy = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        self.session.mount('https://', HTTPAdapter(pool_connections=4, pool_maxsize=10,
+                                                   max_retries=retry_strategy))
         
-    def generate_pkce_params(self) -> Dict[str, str]:
-        """Generate PKCE parameters for secure OAuth flow."""
-        code_verifier = base64.urlsafe_b64encode(secrets.token_bytes(32)).decode('utf-8').rstrip('=')
-        code_challenge = base64.urlsafe_b64encode(
-            hashlib.sha256(code_verifier.encode('utf-8')).digest()
-        ).decode('utf-8').rstrip('=')
+    def _set_redirect_port(self, port: int) -> None:
+        """Point the redirect URI at a local port."""
+        self.redirect_port = port
+        self.redirect_uri = f"http://{self.redirect_host}:{port}/callback"
+        # Authorization URL parameters that are the same for every attempt
+        self._static_auth_params = urllib.parse.urlencode({
+            'client_id': self.client_id,
+            'redirect_uri': self.redirect_uri,
+            'response_type': 'code'
+        })
+    
+    def generate_pkce_params(self, verifier_bytes: Optional[bytes] = None) -> Dict[str, str]:
+        """Generate PKCE parameters for secure OAuth flow.
+        
+        The verifier is derived from ``verifier_bytes``, or from 32 fresh
+        random bytes when none are given.
+        """
+        if verifier_bytes is None:
+            verifier_bytes = secrets.token_bytes(32)
+        
+        # Per RFC 7636 the challenge is the SHA-256 of the ASCII verifier,
+        # which is exactly its Base64Url bytes; decode only for the result
+        code_verifier = base64.urlsafe_b64encode(verifier_bytes).rstrip(b'=')
+        code_challenge = base64.urlsafe_b64encode(hashlib.sha256(code_verifier).digest()).rstrip(b'=')
         
         return {
-            'code_verifier': code_verifier,
-            'code_challenge': code_challenge,
+            'code_verifier': code_verifier.decode('ascii'),
+            'code_challenge': code_challenge.decode('ascii'),
             'code_challenge_method': 'S256'
         }
     
     def get_authorization_url(self, scopes: list) -> tuple:
         """Generate authorization URL and state."""
-        self.state = secrets.token_urlsafe(32)
-        pkce_params = self.generate_pkce_params()
+        # One read from the OS random source covers both the state and the verifier
+        raw = os.urandom(64)
+        state_bytes, verifier_bytes = raw[:32], raw[32:]
+        self.state = base64.urlsafe_b64encode(state_bytes).rstrip(b'=').decode('ascii')
+        pkce_params = self.generate_pkce_params(verifier_bytes)
         
         params = {
-            'client_id': self.client_id,
-            'redirect_uri': self.redirect_uri,
             'scope': ' '.join(scopes),
             'state': self.state,
-            'response_type': 'code',
             'code_challenge': pkce_params['code_challenge'],
             'code_challenge_method': pkce_params['code_challenge_method']
         }
         
-        auth_url = f"https://github.com/login/oauth/authorize?{urllib.parse.urlencode(params)}"
+        auth_url = (f"https://github.com/login/oauth/authorize?"
+                    f"{self._static_auth_params}&{urllib.parse.urlencode(params)}")
         return auth_url, pkce_params['code_verifier']
     
-    def start_callback_server(self) -> HTTPServer:
-        """Start local server to handle OAuth callback."""
+    def start_callback_server(self) -> CallbackServer:
+        """Create the local server that handles the OAuth callback.
+        
+        If the redirect port is taken and the redirect host is LOOPBACK_IP,
+        the next REDIRECT_PORT_ATTEMPTS ports are tried and the redirect URI
+        is updated to the one that was bound.
+        """
         
         class CallbackHandler(BaseHTTPRequestHandler):
             def __init__(self, oauth_instance, *args, **kwargs):
@@ -73,39 +151,38 @@ class GitHubOAuth:
                 super().__init__(*args, **kwargs)
                 
             def do_GET(self):
-                parsed_path = urllib.parse.urlparse(self.path)
-                query_params = urllib.parse.parse_qs(parsed_path.query)
+                # Answer anything but the callback (e.g. /favicon.ico) without parsing
+                path, _, query = self.path.partition('?')
+                if path != '/callback':
+                    self.send_error(404, "Not found")
+                    return
                 
-                if parsed_path.path == '/callback':
-                    if 'code' in query_params and 'state' in query_params:
-                        received_state = query_params['state'][0]
-                        if received_state == self.oauth_instance.state:
-                            self.oauth_instance.auth_code = query_params['code'][0]
-                            
-                            self.send_response(200)
-                            self.send_header('Content-type', 'text/html')
-                            self.end_headers()
-                            
-                            success_html = """
-                            <html>
-                            <head><title>GitHub OAuth Success</title></head>
-                            <body>
-                                <h2>✅ Authentication Successful!</h2>
-                                <p>You can close this window and return to the terminal.</p>
-                                <script>setTimeout(function(){ window.close(); }, 3000);</script>
-                            </body>
-                            </html>
-                            """
-                            self.wfile.write(success_html.encode())
-                        else:
-                            self.send_error(400, "Invalid state parameter")
-                    elif 'error' in query_params:
-                        error = query_params['error'][0]
-                        self.send_error(400, f"OAuth error: {error}")
+                params = dict(urllib.parse.parse_qsl(query))
+                # Constant-time comparison; bytes also accept non-ASCII input
+                expected_state = self.oauth_instance.state or ''
+                state_ok = bool(expected_state) and hmac.compare_digest(
+                    params.get('state', '').encode('utf-8'), expected_state.encode('utf-8'))
+                
+                # Only a callback for this attempt ends the wait, so a stale tab
+                # or a forged local request cannot abort a real login
+                if 'code' in params and 'state' in params:
+                    if state_ok:
+                        self.oauth_instance.auth_code = params['code']
+                        
+                        self.send_response(200)
+                        for header, value in _SUCCESS_HEADERS:
+                            self.send_header(header, value)
+                        self.end_headers()
+                        self.wfile.write(_SUCCESS_HTML)
+                        self.oauth_instance.auth_event.set()
                     else:
-                        self.send_error(400, "Missing required parameters")
+                        self.send_error(400, "Invalid state parameter")
+                elif 'error' in params:
+                    self.send_error(400, f"OAuth error: {params['error']}")
+                    if state_ok:
+                        self.oauth_instance.auth_event.set()
                 else:
-                    self.send_error(404, "Not found")
+                    self.send_error(400, "Missing required parameters")
                     
             def log_message(self, format, *args):
                 # Suppress server logs
@@ -116,8 +193,19 @@ class GitHubOAuth:
                 return CallbackHandler(oauth_instance, *args, **kwargs)
             return handler
         
-        server = HTTPServer(('localhost', self.redirect_port), handler_factory(self))
-        return server
+        first_port = self.redirect_port
+        attempts = REDIRECT_PORT_ATTEMPTS if self.redirect_host == LOOPBACK_IP else 0
+        for port in range(first_port, first_port + attempts + 1):
+            try:
+                server = CallbackServer((self.redirect_host, port), handler_factory(self))
+            except OSError as e:
+                bind_error = e
+                continue
+            if port != first_port:
+                print(f"⚠️  Port {first_port} is in use, using port {port} instead")
+                self._set_redirect_port(port)
+            return server
+        raise bind_error
     
     def exchange_code_for_token(self, auth_code: str, code_verifier: str) -> Optional[str]:
         """Exchange authorization code for access token."""
@@ -137,7 +225,7 @@ class GitHubOAuth:
         }
         
         try:
-            response = requests.post(token_url, data=data, headers=headers)
+            response = self.session.post(token_url, data=data, headers=headers)
             response.raise_for_status()
             
             token_data = response.json()
@@ -161,19 +249,26 @@ class GitHubOAuth:
         print("🔐 Starting GitHub OAuth authentication...")
         print(f"📋 Requesting scopes: {', '.join(scopes)}")
         
-        # Generate authorization URL
-        auth_url, code_verifier = self.get_authorization_url(scopes)
+        # Forget any earlier attempt on this instance
+        self.auth_event.clear()
+        self.auth_code = None
+        self.state = None
+        self.cancelled = False
         
-        # Start callback server
+        # Start callback server first; it may move to another port
         print(f"🌐 Starting local server on port {self.redirect_port}...")
-        server = self.start_callback_server()
-        
-        def run_server():
-            server.serve_forever()
+        try:
+            server = self.start_callback_server()
+        except OSError as e:
+            print(f"❌ Could not start local server on port {self.redirect_port}: {e}")
+            if self.redirect_host != LOOPBACK_IP:
+                print(f"💡 Free port {self.redirect_port}, or register 'http://{LOOPBACK_IP}:{self.redirect_port}/callback' "
+                      f"and set GITHUB_OAUTH_REDIRECT_HOST={LOOPBACK_IP} to allow other ports")
+            return None
+        Thread(target=server.serve_forever, daemon=True).start()
         
-        server_thread = Thread(target=run_server)
-        server_thread.daemon = True
-        server_thread.start()
+        # Generate authorization URL
+        auth_url, code_verifier = self.get_authorization_url(scopes)
         
         # Open browser for authorization
         print(f"🚀 Opening browser for GitHub authorization...")
@@ -188,12 +283,24 @@ class GitHubOAuth:
         # Wait for callback
         print("⏳ Waiting for authorization callback...")
         timeout = 300  # 5 minutes timeout
-        start_time = time.time()
         
-        while self.auth_code is None and (time.time() - start_time) < timeout:
-            time.sleep(1)
+        # Event.wait() wakes up for Ctrl-C, so the interrupt cancels the wait
+        try:
+            self.auth_event.wait(timeout=timeout)
+        except KeyboardInterrupt:
+            self.cancelled = True
+        
+        # The callback is handled on a request thread, so wait on the event
+        # and stop the server in the background instead of on this path
+        def stop_server():
+            server.shutdown()
+            server.server_close()
         
-        server.shutdown()
+        Thread(target=stop_server, daemon=True).start()
+        
+        if self.cancelled:
+            print("\n⚠️  OAuth authentication cancelled")
+            return None
         
         if self.auth_code is None:
             print("❌ OAuth authentication timed out or was cancelled")
@@ -218,7 +325,7 @@ class GitHubOAuth:
         }
         
         try:
-            response = requests.get('https://api.github.com/user', headers=headers)
+            response = self.session.get('https://api.github.com/user', headers=headers)
             response.raise_for_status()
             
             user_data = response.json()
@@ -238,17 +345,22 @@ class GitHubOAuth:
 
 def setup_github_app():
     """Guide user through GitHub App setup."""
-    print("📱 To use OAuth authentication, you need a GitHub OAuth App.")
-    print("📋 Follow these steps:")
-    print()
-    print("1️⃣ Go to: https://github.com/settings/applications/new")
-    print("2️⃣ Fill in the form:")
-    print("   • Application name: 'GitHub Org Backup Tool'")
-    print("   • Homepage URL: 'http://localhost:8080'")
-    print("   • Authorization callback URL: 'http://localhost:8080/callback'")
-    print("3️⃣ Click 'Register application'")
-    print("4️⃣ Copy the Client ID and Client Secret")
-    print()
+    # Written in one call so the block is not split by other output
+    lines = [
+        "📱 To use OAuth authentication, you need a GitHub OAuth App.",
+        "📋 Follow these steps:",
+        "",
+        "1️⃣ Go to: https://github.com/settings/applications/new",
+        "2️⃣ Fill in the form:",
+        "   • Application name: 'GitHub Org Backup Tool'",
+        f"   • Homepage URL: 'http://{REDIRECT_HOST}:8080'",
+        f"   • Authorization callback URL: 'http://{REDIRECT_HOST}:8080/callback'",
+        "3️⃣ Click 'Register application'",
+        "4️⃣ Copy the Client ID and Client Secret",
+        "",
+    ]
+    sys.stdout.write('\n'.join(lines) + '\n')
+    sys.stdout.flush()
     
     client_id = input("Enter your GitHub OAuth App Client ID: ").strip()
     client_secret = input("Enter your GitHub OAuth App Client Secret: ").strip()
@@ -268,25 +380,35 @@ def save_oauth_config(client_id: str, client_secret: str, access_token: str):
         'access_token': access_token
     }
     
-    with open('oauth_config.json', 'w') as f:
-        json.dump(oauth_config, f, indent=2)
+    data = json_dumps_pretty(oauth_config)
     
-    print("💾 OAuth configuration saved to oauth_config.json")
+    # Write a private temporary file and rename it over the old one, so the
+    # secrets are never world-readable and a crash cannot leave a torn file
+    tmp_path = f"{OAUTH_CONFIG_FILE}.tmp"
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.chmod(tmp_path, 0o600)
+    os.replace(tmp_path, OAUTH_CONFIG_FILE)
+    
+    print(f"💾 OAuth configuration saved to {OAUTH_CONFIG_FILE}")
 
 
 def load_oauth_config() -> Optional[Dict]:
     """Load OAuth configuration from file."""
     try:
-        with open('oauth_config.json', 'r') as f:
-            return json.load(f)
+        with open(OAUTH_CONFIG_FILE, 'rb') as f:
+            data = f.read()
     except FileNotFoundError:
         return None
+    
+    return json_loads(data)
 
 
 def main():
     """Main OAuth setup function."""
-    print("🔐 GitHub OAuth Authentication Setup")
-    print("=" * 50)
+    sys.stdout.write("🔐 GitHub OAuth Authentication Setup\n" + "=" * 50 + "\n")
+    sys.stdout.flush()
     
     # Check if OAuth config already exists
     existing_config = load_oauth_config()
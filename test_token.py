@@ -3,9 +3,81 @@
 Quick token test script
 """
 
+import asyncio
 import requests
 import sys
 
+try:
+    import aiohttp
+except ImportError:  # Optional dependency, checks run one after another without it
+    aiohttp = None
+
+# Fetches only the repository names needed for the organization check
+ORG_REPOS_QUERY = """
+query($org: String!) {
+  organization(login: $org) {
+    repositories(first: 10) {
+      totalCount
+      nodes { name }
+    }
+  }
+}
+"""
+
+
+async def _check_token_async(token, org_name):
+    """Run the user and organization checks concurrently.
+    
+    Returns ((user status, scopes header), (org status, GraphQL response or None)).
+    """
+    headers = {
+        'Authorization': f'token {token}',
+        'Accept': 'application/vnd.github.v3+json'
+    }
+    
+    async with aiohttp.ClientSession(headers=headers) as session:
+        async def check_user():
+            async with session.get('https://api.github.com/user') as response:
+                return response.status, response.headers.get('X-OAuth-Scopes', '')
+        
+        async def check_org():
+            async with session.post(
+                'https://api.github.com/graphql',
+                json={'query': ORG_REPOS_QUERY, 'variables': {'org': org_name}}
+            ) as response:
+                data = await response.json() if response.status == 200 else None
+                return response.status, data
+        
+        return await asyncio.gather(check_user(), check_org())
+
+
+def _check_token(token, org_name):
+    """Run the user check, then the organization check if one was given.
+    
+    Returns the same values as _check_token_async.
+    """
+    # Both requests go through one session so the connection is reused
+    session = requests.Session()
+    session.headers.update({
+        'Authorization': f'token {token}',
+        'Accept': 'application/vnd.github.v3+json'
+    })
+    
+    response = session.get('https://api.github.com/user')
+    user_result = (response.status_code, response.headers.get('X-OAuth-Scopes', ''))
+    
+    org_result = (None, None)
+    if org_name and response.status_code == 200:
+        repos_response = session.post(
+            'https://api.github.com/graphql',
+            json={'query': ORG_REPOS_QUERY, 'variables': {'org': org_name}}
+        )
+        data = repos_response.json() if repos_response.status_code == 200 else None
+        org_result = (repos_response.status_code, data)
+    
+    return user_result, org_result
+
+
 def test_token_scopes():
     # Read token from input
     print("🔑 Please test your new token:")
@@ -15,39 +87,33 @@ def test_token_scopes():
         print("❌ No token provided")
         return False
     
-    headers = {
-        'Authorization': f'token {token}',
-        'Accept': 'application/vnd.github.v3+json'
-    }
+    # Asked up front so both checks can be sent at once
+    org_name = input("Enter organization name to test (or press Enter to skip): ").strip()
     
-    # Test authentication and get scopes
-    response = requests.get('https://api.github.com/user', headers=headers)
+    if org_name and aiohttp is not None:
+        (user_status, scopes), (org_status, org_data) = asyncio.run(_check_token_async(token, org_name))
+    else:
+        (user_status, scopes), (org_status, org_data) = _check_token(token, org_name)
     
-    if response.status_code != 200:
-        print(f"❌ Authentication failed: {response.status_code}")
+    # Test authentication and get scopes
+    if user_status != 200:
+        print(f"❌ Authentication failed: {user_status}")
         return False
     
-    scopes = response.headers.get('X-OAuth-Scopes', '').split(', ')
-    print(f"✅ Token scopes: {scopes}")
+    print(f"✅ Token scopes: {scopes.split(', ')}")
     
     # Test repository access
-    org_name = input("Enter organization name to test (or press Enter to skip): ").strip()
-    
     if org_name:
-        repos_response = requests.get(
-            f'https://api.github.com/orgs/{org_name}/repos', 
-            headers=headers,
-            params={'type': 'all', 'per_page': 10}
-        )
+        organization = ((org_data or {}).get('data') or {}).get('organization')
         
-        if repos_response.status_code == 200:
-            repos = repos_response.json()
-            print(f"✅ Found {len(repos)} repositories in {org_name}!")
-            for repo in repos[:3]:
+        if organization:
+            repositories = organization['repositories']
+            print(f"✅ Found {repositories['totalCount']} repositories in {org_name}!")
+            for repo in repositories['nodes'][:3]:
                 print(f"   - {repo['name']}")
             return True
         else:
-            print(f"❌ Repository access failed for {org_name}: {repos_response.status_code}")
+            print(f"❌ Repository access failed for {org_name}: {org_status}")
             return False
     else:
         print("⏭️  Skipping organization test")